@@ -0,0 +1,116 @@
+'''Benchmarks for speccer
+
+Each module defines `bench_*' functions, each running one iteration of some workload.
+Run a module with e.g.
+
+    $ python -m benchmarks.bench_model
+    $ python -m benchmarks.bench_model --profile
+    $ python -m benchmarks.bench_model --memory
+    $ python -m benchmarks.bench_model --json
+
+or every module, writing JSON results to compare across commits, with
+
+    $ python -m benchmarks -o before.json
+    $ git checkout some-branch
+    $ python -m benchmarks -o after.json
+    $ python -m benchmarks --compare before.json after.json
+'''
+import sys
+import json
+import pstats
+import timeit
+import cProfile
+import functools
+import tracemalloc
+
+from speccer import config, grapher, strategy
+
+def _isolated(f):
+    '''Run `f' with graphviz off and a new generation graph, dropped afterwards
+
+    Otherwise every spec() renders the one global graph, which grows with every
+    value generated by every iteration, and is most of what --memory would count
+    '''
+    @functools.wraps(f)
+    def isolated():
+        graphviz, graph = config.CONFIG.graphviz, strategy.generation_graph
+        config.CONFIG.graphviz = False
+        strategy.generation_graph = grapher.Graph()
+        try:
+            return f()
+        finally:
+            config.CONFIG.graphviz, strategy.generation_graph = graphviz, graph
+    return isolated
+
+def _benches(benches):
+    for name, f in sorted(benches.items()):
+        if name.startswith('bench_') and callable(f):
+            yield name, f
+
+def _autorange(timer):
+    '''The number of iterations, 1, 2, 5, 10, 20, 50, ... that take at least 0.2s
+    as timeit.Timer.autorange, which is new in Python 3.6
+    '''
+    i = 1
+    while True:
+        for j in 1, 2, 5:
+            if timer.timeit(i*j) >= 0.2:
+                return i*j
+        i *= 10
+
+def results(benches, number=None, repeat=3):
+    '''Time each of the `bench_*' functions in `benches' (a module namespace)
+    returning a dict of name -> {'best': seconds per iteration, 'number': iterations per repeat, 'repeat': repeats}
+    '''
+    out = {}
+    for name, f in _benches(benches):
+        timer = timeit.Timer(_isolated(f))
+        n = number or _autorange(timer)
+        best = min(timer.repeat(repeat=repeat, number=n)) / n
+        out[name] = dict(best=best, number=n, repeat=repeat)
+    return out
+
+def run(benches, number=None, repeat=3):
+    '''Time each of the `bench_*' functions in `benches' (a module namespace)
+    printing the best time per iteration
+    '''
+    for name, f in _benches(benches):
+        r = results({name: f}, number=number, repeat=repeat)[name]
+        print('{:<40} {:>12.1f} us'.format(name, r['best'] * 1e6))
+
+def profile(benches, top=10):
+    '''Profile each of the `bench_*' functions in `benches' printing the top entries
+    by internal time
+    '''
+    for name, f in _benches(benches):
+        print(name)
+        p = cProfile.Profile()
+        p.runcall(_isolated(f))
+        pstats.Stats(p, stream=sys.stdout).sort_stats('tottime').print_stats(top)
+
+def memory(benches):
+    '''Run each of the `bench_*' functions in `benches' once under tracemalloc
+    printing the number of memory blocks still allocated afterwards
+    and the peak traced memory
+    '''
+    for name, f in _benches(benches):
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        _isolated(f)()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+        blocks = sum(s.count_diff for s in after.compare_to(before, 'lineno') if s.count_diff > 0)
+        print('{:<40} {:>8} retained blocks {:>10.1f} KiB peak'.format(name, blocks, peak / 1024))
+
+def main(benches):
+    if '--profile' in sys.argv[1:]:
+        profile(benches)
+    elif '--memory' in sys.argv[1:]:
+        memory(benches)
+    elif '--json' in sys.argv[1:]:
+        json.dump(results(benches), sys.stdout, indent=2, sort_keys=True)
+        print()
+    else:
+        run(benches)
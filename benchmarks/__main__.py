@@ -0,0 +1,113 @@
+'''Run every benchmark module, writing the results as JSON
+
+    $ python -m benchmarks [-o results.json] [-k pattern] [--repeat N]
+    $ python -m benchmarks --compare before.json after.json
+
+The JSON is
+    {"commit": ..., "python": ..., "time": ..., "benchmarks": {"bench_model.bench_x": {"best": seconds, ...}, ...}}
+'''
+import os
+import sys
+import json
+import time
+import pkgutil
+import argparse
+import platform
+import importlib
+import subprocess
+
+import benchmarks
+
+def _commit():
+    try:
+        out = subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            stderr=subprocess.DEVNULL)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.decode().strip()
+
+def _modules():
+    for _, name, _ in pkgutil.iter_modules(benchmarks.__path__):
+        if name.startswith('bench_'):
+            yield name, importlib.import_module('benchmarks.{}'.format(name))
+
+def collect(pattern=None, repeat=3):
+    '''Time every `bench_*' function of every `bench_*' module
+    whose qualified name `module.function' contains `pattern'
+    '''
+    out = {}
+    for mod_name, mod in _modules():
+        benches = {
+            name: f for name, f in vars(mod).items()
+            if pattern is None or pattern in '{}.{}'.format(mod_name, name)}
+
+        for name, r in benchmarks.results(benches, repeat=repeat).items():
+            qualname = '{}.{}'.format(mod_name, name)
+            print('{:<60} {:>12.1f} us'.format(qualname, r['best'] * 1e6), file=sys.stderr)
+            out[qualname] = r
+
+    return dict(
+        commit=_commit(),
+        python=platform.python_version(),
+        time=time.strftime('%Y-%m-%dT%H:%M:%S'),
+        benchmarks=out)
+
+def compare(before, after, threshold=0.1):
+    '''Print the change in time of each benchmark in both `before' and `after' (as returned by :func:`collect`)
+    marking those slower or faster by more than `threshold'
+
+    Returns the number of benchmarks that got slower
+    '''
+    slower = 0
+    a, b = before['benchmarks'], after['benchmarks']
+    for name in sorted(a.keys() & b.keys()):
+        ratio = b[name]['best'] / a[name]['best']
+        mark = ''
+        if ratio > 1 + threshold:
+            mark = 'slower'
+            slower += 1
+        elif ratio < 1 - threshold:
+            mark = 'faster'
+
+        print('{:<60} {:>12.1f} us {:>12.1f} us {:>7.2f}x {}'.format(
+            name, a[name]['best'] * 1e6, b[name]['best'] * 1e6, ratio, mark))
+
+    for name in sorted(a.keys() - b.keys()):
+        print('{:<60} removed'.format(name))
+    for name in sorted(b.keys() - a.keys()):
+        print('{:<60} added'.format(name))
+
+    return slower
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    parser.add_argument('-o', '--output', help='write the JSON results to this file instead of stdout')
+    parser.add_argument('-k', dest='pattern', help='only run benchmarks whose name contains this')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'),
+                        help='compare two JSON results files; exits 1 if any benchmark got slower')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='relative change ignored by --compare (default 0.1)')
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        before, after = args.compare
+        with open(before) as f:
+            before = json.load(f)
+        with open(after) as f:
+            after = json.load(f)
+        return 1 if compare(before, after, threshold=args.threshold) else 0
+
+    out = collect(pattern=args.pattern, repeat=args.repeat)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(out, f, indent=2, sort_keys=True)
+    else:
+        json.dump(out, sys.stdout, indent=2, sort_keys=True)
+        print()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
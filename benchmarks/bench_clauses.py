@@ -0,0 +1,78 @@
+'''Benchmarks for evaluating properties
+'''
+import io
+import typing
+
+from speccer import spec, forall, exists, _types as types
+
+def _run(prop, depth):
+    g = prop.run(depth)
+    try:
+        while True:
+            next(g)
+    except StopIteration as e:
+        return e.value
+
+# Nat at depth 999999 has 1M values
+FORALL_1M = forall(types.Nat, lambda n: n >= 0)
+
+def bench_forall_1m():
+    '''a 1M case forall that passes'''
+    _run(FORALL_1M, 999999)
+
+def bench_nested_forall_exists():
+    _run(forall(int, lambda x: exists(int, lambda y: x + y == 0)), 300)
+
+# nested quantifiers at several depths
+FORALL_FORALL = forall(int, lambda x: forall(int, lambda y: x + y == y + x))
+FORALL_FORALL_FORALL = forall(int, lambda x: forall(int, lambda y: forall(int, lambda z: x + (y + z) == (x + y) + z)))
+FORALL_EXISTS_LIST = forall(typing.List[int], lambda xs: exists(int, lambda y: y not in xs))
+
+def bench_forall_forall_depth10():
+    _run(FORALL_FORALL, 10)
+
+def bench_forall_forall_depth100():
+    _run(FORALL_FORALL, 100)
+
+def bench_forall_forall_forall_depth5():
+    _run(FORALL_FORALL_FORALL, 5)
+
+def bench_forall_forall_forall_depth20():
+    _run(FORALL_FORALL_FORALL, 20)
+
+def bench_forall_exists_list_depth3():
+    _run(FORALL_EXISTS_LIST, 3)
+
+def bench_forall_exists_list_depth4():
+    _run(FORALL_EXISTS_LIST, 4)
+
+# making properties, as nested properties are made once per case of the outer one
+def bench_construct_forall_10000():
+    '''10000 forall properties'''
+    for _ in range(10000):
+        forall(int, lambda x: True)
+
+def bench_construct_nested_forall_10000():
+    '''10000 outer cases, each making an inner forall'''
+    f = lambda x: forall(int, lambda y: True)
+    for i in range(10000):
+        f(i)
+
+# overhead of the text progress output, on a trivial predicate
+TRIVIAL = forall(types.Nat, lambda n: True)
+
+def _spec_trivial(**options):
+    spec(99999, TRIVIAL, outfile=io.StringIO(), **options)
+
+def bench_spec_100k_no_progress():
+    _spec_trivial(progress=None)
+
+def bench_spec_100k_dots():
+    _spec_trivial(progress='dots')
+
+def bench_spec_100k_status():
+    _spec_trivial(progress='status')
+
+if __name__ == '__main__':
+    from benchmarks import main
+    main(globals())
@@ -0,0 +1,43 @@
+'''Benchmarks comparing compiled strategies against Strategy[t] over nested types
+'''
+import typing
+
+from speccer import Strategy
+from speccer import compiled
+
+LIST_INT = typing.List[int]
+LIST_LIST_INT = typing.List[typing.List[int]]
+LIST_TUPLE_UNION = typing.List[typing.Tuple[int, typing.Union[str, bool]]]
+TUPLE_LIST = typing.Tuple[typing.List[int], typing.List[bool], str]
+
+def _drain(it):
+    for _ in it:
+        pass
+
+def bench_strategy_list_int_depth4():
+    _drain(Strategy[LIST_INT](4))
+
+def bench_compiled_list_int_depth4():
+    _drain(compiled.values(4, LIST_INT))
+
+def bench_strategy_list_list_int_depth3():
+    _drain(Strategy[LIST_LIST_INT](3))
+
+def bench_compiled_list_list_int_depth3():
+    _drain(compiled.values(3, LIST_LIST_INT))
+
+def bench_strategy_list_tuple_union_depth3():
+    _drain(Strategy[LIST_TUPLE_UNION](3))
+
+def bench_compiled_list_tuple_union_depth3():
+    _drain(compiled.values(3, LIST_TUPLE_UNION))
+
+def bench_strategy_tuple_list_depth3():
+    _drain(Strategy[TUPLE_LIST](3))
+
+def bench_compiled_tuple_list_depth3():
+    _drain(compiled.values(3, TUPLE_LIST))
+
+if __name__ == '__main__':
+    from benchmarks import main
+    main(globals())
@@ -0,0 +1,108 @@
+'''Benchmarks for generating model command sequences
+'''
+import collections
+
+from speccer import Model, Strategy, command, model
+
+class Thing:
+    pass
+
+class ChainModel(Model):
+    _STATE = None
+
+    @command
+    def new() -> Thing:
+        return Thing()
+
+    @command
+    def step(x: Thing) -> Thing:
+        return x
+
+def _chain(n):
+    '''n partials, each consuming the result of the one before'''
+    partials = [model.Partial(ChainModel.new, collections.OrderedDict())]
+    for i in range(1, n):
+        arg = model.ValueArg(model.ModelMeta.replacement_t(i - 1))
+        partials.append(model.Partial(ChainModel.step, collections.OrderedDict(x=arg)))
+    return partials
+
+CHAIN_150 = _chain(150)
+
+def bench_name_partials_150():
+    '''150 bound results, 149 of them named'''
+    model._name_partials(CHAIN_150)
+
+def bench_get_var_1000():
+    for i in range(1000):
+        model.GET_VAR(i)
+
+class ListModel(Model):
+    _STATE = None
+
+    @command
+    def new() -> list:
+        return []
+
+    @command
+    def append(xs: list, v: int) -> None:
+        xs.append(v)
+
+    @command
+    def pop(xs: list) -> int:
+        return xs.pop()
+
+def bench_generate_commands_depth4():
+    for _ in Strategy[ListModel.Commands](4):
+        pass
+
+class StackModel(Model):
+    '''ListModel with a model state, pre- and post-conditions'''
+    _STATE = None
+
+    @command
+    def new() -> list:
+        return []
+
+    @command
+    def push(xs: list, v: int) -> None:
+        xs.append(v)
+
+    @command
+    def pop(xs: list) -> int:
+        return xs.pop()
+
+    def new_pre(self, args):
+        return self.state is None
+
+    def new_next(self, args, result):
+        return []
+
+    def push_next(self, args, result):
+        return self.state + [args[1]]
+
+    def pop_pre(self, args):
+        return self.state != []
+
+    def pop_post(self, args, result):
+        return result == self.state[-1]
+
+    def pop_next(self, args, result):
+        return self.state[:-1]
+
+# validating each generated command sequence against the model, at several depths
+def _validate(depth):
+    for ps in Strategy[StackModel.Commands](depth):
+        ps.is_valid()
+
+def bench_validate_commands_depth2():
+    _validate(2)
+
+def bench_validate_commands_depth3():
+    _validate(3)
+
+def bench_validate_commands_depth4():
+    _validate(4)
+
+if __name__ == '__main__':
+    from benchmarks import main
+    main(globals())
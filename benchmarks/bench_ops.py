@@ -0,0 +1,78 @@
+'''Benchmarks for value_args products and strategies built with mapS and implies
+'''
+import typing
+
+from speccer import Strategy, mapS, implies, value_args
+
+def _drain(it):
+    for _ in it:
+        pass
+
+def bench_value_args_int_int_depth100():
+    _drain(value_args(100, int, int))
+
+def bench_value_args_int_str_bool_depth20():
+    _drain(value_args(20, int, str, bool))
+
+def bench_value_args_list_int_int_depth4():
+    _drain(value_args(4, typing.List[int], int))
+
+class Doubled:
+    pass
+
+class Quadrupled:
+    pass
+
+class Octupled:
+    pass
+
+@mapS(Strategy[int], register_type=Doubled)
+def DoubledStrat(depth, v):
+    yield 2 * v
+
+@mapS(Strategy[Doubled], register_type=Quadrupled)
+def QuadrupledStrat(depth, v):
+    yield 2 * v
+
+@mapS(Strategy[Quadrupled], register_type=Octupled)
+def OctupledStrat(depth, v):
+    yield 2 * v
+
+def bench_mapS_chain_1_depth1000():
+    _drain(Strategy[Doubled](1000))
+
+def bench_mapS_chain_3_depth1000():
+    _drain(Strategy[Octupled](1000))
+
+def is_even(n):
+    return n % 2 == 0
+
+def is_small(n):
+    return abs(n) < 500
+
+def is_sorted(xs):
+    return xs == sorted(xs)
+
+def is_short(xs):
+    return len(xs) < 3
+
+EVEN = implies(is_even, int)
+EVEN_SMALL = implies(is_small, EVEN)
+SORTED = implies(is_sorted, typing.List[int])
+SORTED_SHORT = implies(is_short, SORTED)
+
+def bench_implies_chain_1_depth1000():
+    _drain(Strategy[EVEN](1000))
+
+def bench_implies_chain_2_depth1000():
+    _drain(Strategy[EVEN_SMALL](1000))
+
+def bench_implies_sorted_list_depth4():
+    _drain(Strategy[SORTED](4))
+
+def bench_implies_sorted_short_list_depth4():
+    _drain(Strategy[SORTED_SHORT](4))
+
+if __name__ == '__main__':
+    from benchmarks import main
+    main(globals())
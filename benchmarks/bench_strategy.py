@@ -0,0 +1,64 @@
+'''Benchmarks for looking up and running strategies
+'''
+import typing
+
+from speccer import Strategy
+from speccer import _types as types
+
+LIST_TUPLE = typing.List[typing.Tuple[int, str]]
+
+# (type, depth) for each type with a built-in strategy
+BUILTIN = {
+    'int': (int, 10000),
+    'nat': (types.Nat, 10000),
+    'neg': (types.Neg, 10000),
+    'word2': (types.Word2, 10),
+    'word4': (types.Word4, 10),
+    'word8': (types.Word8, 10),
+    'str': (str, 1000),
+    'bool': (bool, 10),
+    'none': (None, 10),
+    'list_int': (typing.List[int], 4),
+    'set_int': (typing.Set[int], 4),
+    'tuple_int_str': (typing.Tuple[int, str], 30),
+    'union_int_str': (typing.Union[int, str], 1000),
+    'permutations_bool': (types.Permutations[bool], 10),
+}
+
+def _values(t, depth):
+    s = Strategy[t]
+
+    def bench():
+        for _ in s(depth):
+            pass
+
+    bench.__doc__ = 'all values of Strategy[{}]({})'.format(t, depth)
+    return bench
+
+for _name, (_t, _depth) in BUILTIN.items():
+    globals()['bench_values_{}'.format(_name)] = _values(_t, _depth)
+
+def bench_lookup_list_tuple_1000():
+    '''1000 lookups of Strategy[List[Tuple[int, str]]]'''
+    for _ in range(1000):
+        Strategy[LIST_TUPLE]
+
+def bench_lookup_literal_alias_1000():
+    '''1000 lookups of an unhashable literal alias'''
+    for _ in range(1000):
+        Strategy[[(int, str)]]
+
+def bench_construct_iterate_int_1000():
+    '''1000 constructions and full iterations of Strategy[int](3)'''
+    s = Strategy[int]
+    for _ in range(1000):
+        for _ in s(3):
+            pass
+
+def bench_iterate_list_int_depth4():
+    for _ in Strategy[typing.List[int]](4):
+        pass
+
+if __name__ == '__main__':
+    from benchmarks import main
+    main(globals())
@@ -17,4 +17,7 @@ setup(
     author_email='bs829@york.ac.uk',
     url='https://github.com/bensimner/speccer',
     packages=find_packages(exclude=('tests', 'docs')),
+    entry_points={
+        'pytest11': ['speccer = speccer.pytest_plugin'],
+    },
 )
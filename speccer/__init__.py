@@ -11,12 +11,18 @@ from .ops import *
 from .pset import *
 from .asserts import *
 from .clauses import *
+from .parallel import *
+from .linearizable import *
+from .memo import *
 from . import spec as specM
 
-def spec(depth, testable, outfile=sys.stdout):
+def spec(depth, testable, outfile=sys.stdout, **options):
     '''Runs speccer on some testable type (function, Property)
+
+    Any extra keyword arguments are passed to :class:`spec.Options`
+    pass outfile=None for no text output
     '''
-    return specM.spec(depth, testable, specM.Options(output_file=outfile))
+    return specM.spec(depth, testable, specM.Options(output_file=outfile, **options))
 
 def enableLogging(debug=False):
     logging.config.dictConfig({
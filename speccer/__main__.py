@@ -0,0 +1,68 @@
+'''Run the properties in some modules
+
+    $ python -m speccer [-d DEPTH] [--no-cache] TARGET...
+
+where each TARGET is a module (running all its `prop_*' functions and PropertySet's)
+or module:name for a single property or PropertySet.
+
+Properties that passed before and are unchanged since are skipped, see speccer.cache,
+unless --no-cache is given. --clear-cache forgets every cached pass first.
+Exits with status 1 if any property did not pass.
+'''
+import sys
+import argparse
+import importlib
+
+from . import cache
+from . import clauses
+from . import pset
+from . import parallel
+from .spec import Options, spec as run_spec
+
+def _targets(target):
+    '''The (name, obj) pairs of the properties and PropertySet's named by `target'
+    '''
+    mod_name, _, name = target.partition(':')
+    mod = importlib.import_module(mod_name)
+    if name:
+        yield name, getattr(mod, name)
+        return
+
+    for name, obj in sorted(vars(mod).items()):
+        if name.startswith('prop_') and callable(obj):
+            yield name, obj
+        elif isinstance(obj, type) and issubclass(obj, pset.PropertySet) and obj is not pset.PropertySet:
+            yield name, obj
+
+def _passed(out):
+    if isinstance(out, parallel.PropertySetResult):
+        return out.ok
+    return isinstance(out, clauses.Success)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m speccer')
+    parser.add_argument('targets', nargs='+', metavar='TARGET', help='module or module:name')
+    parser.add_argument('-d', '--depth', type=int, default=5)
+    parser.add_argument('-j', '--processes', type=int, default=0,
+                        help="worker processes to run PropertySet's across (default 0, in this process)")
+    parser.add_argument('--no-cache', dest='cache', action='store_false',
+                        help='run every property, even those unchanged since they passed')
+    parser.add_argument('--clear-cache', action='store_true', help='forget every cached pass first')
+    parser.add_argument('--cache-dir', default=cache.DEFAULT_PATH)
+    args = parser.parse_args(argv)
+
+    if args.clear_cache:
+        cache.invalidate(path=args.cache_dir)
+
+    sys.path.insert(0, '')
+    ok = True
+    for target in args.targets:
+        for name, obj in _targets(target):
+            options = Options(
+                output_file=sys.stdout, cache=args.cache, cache_dir=args.cache_dir, processes=args.processes)
+            ok = _passed(run_spec(args.depth, obj, options)) and ok
+
+    return 0 if ok else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
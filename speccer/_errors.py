@@ -7,3 +7,7 @@ class MissingStrategyError(Exception):
 class InvalidPartials(AssertionError):
     def __init__(self, s, e):
         super().__init__('{{{}}}: {}'.format(s, e))
+
+class NotLinearizable(AssertionError):
+    def __init__(self, s, e):
+        super().__init__('{{{}}}: {}'.format(s, e))
@@ -1,6 +1,8 @@
 import logging
 import contextlib
 
+from .instrument import timed_assertion
+
 __all__ = [
     'assertTrue',
     'assertFalse',
@@ -38,6 +40,7 @@ def _assert(p, succ_m=None, fail_m='_assert'):
     return True
 
 # UnitTest style assertions
+@timed_assertion
 def assertThat(f, *args, fmt='{name}({argv})', fmt_fail='{name}({argv}) is false'):
     s_args = ', '.join(map(repr, args))
 
@@ -48,29 +51,38 @@ def assertThat(f, *args, fmt='{name}({argv})', fmt_fail='{name}({argv}) is false
 
     return _assert(f(*args), fmt.format(argv=s_args, name=name), fmt_fail.format(argv=s_args, name=name))
 
+@timed_assertion
 def assertTrue(a, fmt='True', fmt_fail='False'):
     return _assert(a, fmt.format(a=a), fmt_fail.format(a=a))
 
+@timed_assertion
 def assertFalse(a, fmt='False', fmt_fail='True'):
     return _assert(not a, fmt.format(a=a), fmt_fail.format(a=a))
 
+@timed_assertion
 def assertEqual(a, b, fmt='{a} == {b}', fmt_fail='{a} != {b}'):
     return _assert(a == b, fmt.format(a=a, b=b), fmt_fail.format(a=a, b=b))
 
+@timed_assertion
 def assertIs(a, b, fmt='{a} is {b}', fmt_fail='{a} is not {b}'):
     return _assert(a is b, fmt.format(a=a, b=b), fmt_fail.format(a=a, b=b))
 
+@timed_assertion
 def assertNotEqual(a, b, fmt='{a} != {b}', fmt_fail='{a} == {b}'):
     return _assert(a != b, fmt.format(a=a, b=b), fmt_fail.format(a=a, b=b))
 
+@timed_assertion
 def assertIsNot(a, b, fmt='{a} is not {b}', fmt_fail='{a} is {b}'):
     return _assert(a is not b, fmt.format(a=a, b=b), fmt_fail.format(a=a, b=b))
 
+@timed_assertion
 def assertIsNotInstance(a, b, fmt='not isinstance({a}, {b})', fmt_fail='isinstance({a}, {b})'):
     return _assert(not isinstance(a, b), fmt.format(a=a, b=b), fmt_fail.format(a=a, b=b))
 
+@timed_assertion
 def assertIsInstance(a, b, fmt='isinstance({a}, {b})', fmt_fail='not isinstance({a}, {b})'):
     return _assert(isinstance(a, b), fmt.format(a=a, b=b), fmt_fail.format(a=a, b=b))
 
+@timed_assertion
 def assertIn(a, b, fmt='{a} in {b}', fmt_fail='{a} not in {b}'):
     return _assert(a in b, fmt.format(a=a, b=b), fmt_fail.format(a=a, b=b))
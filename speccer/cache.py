@@ -0,0 +1,212 @@
+# cache.py - Remembering which properties passed, to skip them when unchanged
+import os
+import types
+import shutil
+import hashlib
+import inspect
+import tempfile
+
+from . import clauses
+from . import typeable
+from . import strategy
+from . import _errors
+from . import sourcehash
+
+__all__ = [
+    'ResultCache',
+    'invalidate',
+]
+
+DEFAULT_PATH = '.speccer_cache'
+
+def _strategies(typ):
+    '''The strategies used to generate values of the typeable.Typeable `typ`
+    '''
+    try:
+        yield strategy.get_strat_instance(typ.typ)
+    except _errors.MissingStrategyError:
+        pass
+
+    for a in typ.args:
+        yield from _strategies(a)
+
+def _code_objects(co):
+    yield co
+    for c in co.co_consts:
+        if isinstance(c, types.CodeType):
+            yield from _code_objects(c)
+
+def _referenced(f, seen):
+    '''The values the function `f` refers to by a global name or from its closure,
+    in its code or the code of the functions nested in it (e.g. those of nested quantifiers),
+    and those the user's functions among them refer to in turn
+    '''
+    if id(f) in seen:
+        return
+    seen.add(id(f))
+
+    for cell in f.__closure__ or ():
+        try:
+            yield cell.cell_contents
+        except ValueError:
+            # an empty cell
+            pass
+
+    for co in _code_objects(f.__code__):
+        for name in co.co_names:
+            if name in f.__globals__:
+                v = f.__globals__[name]
+                yield v
+                if isinstance(v, types.FunctionType) and sourcehash._is_user(v):
+                    yield from _referenced(v, seen)
+
+def _referenced_strategies(f, seen):
+    '''The strategies for the types `f` refers to, see :func:`_referenced`
+    so that properties nested in `f`'s cases depend on the strategies they quantify over
+    '''
+    f = inspect.unwrap(f)
+    if not isinstance(f, types.FunctionType):
+        return
+
+    for v in _referenced(f, seen):
+        if isinstance(v, type) or getattr(v, '__origin__', None) is not None:
+            try:
+                yield from _strategies(typeable.from_type(v))
+            except Exception:
+                # not a type typeable understands
+                pass
+
+def _dependencies(prop, seen):
+    '''The functions and strategies whose code decides the outcome of running `prop`
+    '''
+    if isinstance(prop, clauses.Quantified):
+        yield prop.func
+        yield from _strategies(prop.type)
+        yield from _referenced_strategies(prop.func, seen)
+    elif hasattr(prop, 'lhs'):
+        yield from _dependencies(prop.lhs, seen)
+        yield from _dependencies(prop.rhs, seen)
+    else:
+        yield type(prop)
+
+def _source(source):
+    '''What to hash for the `source` of a property, see :class:`ResultCache`
+    the whole PropertySet for one of its methods, as they may call each other through self
+    '''
+    if inspect.ismethod(source):
+        return type(source.__self__)
+    return source
+
+def property_hash(prop, source=None):
+    '''A hash of the code of `prop`'s functions (including those nested in them),
+    the strategies they quantify over, and of the function or PropertySet `source` that made it
+    see :func:`sourcehash.code_hash`
+    '''
+    seen = set()
+    deps = list(_dependencies(prop, seen))
+    if source is not None:
+        deps.append(_source(source))
+        deps.extend(_referenced_strategies(source, seen))
+    return sourcehash.code_hash(*deps)
+
+def _qualname(f):
+    return '{}.{}'.format(getattr(f, '__module__', None), getattr(f, '__qualname__', type(f).__qualname__))
+
+def property_key(prop, source=None):
+    '''What passes of `prop` are recorded against
+
+    The module-qualified name of the function (or PropertySet method) `source` that made it,
+    otherwise of the functions it quantifies, rather than the property's name
+    which can be the same in different modules, or contain the address of a lambda
+    '''
+    if source is not None:
+        return _qualname(source)
+    elif isinstance(prop, clauses.Quantified):
+        return '{}({}, {})'.format(type(prop).__name__, prop.type.pretty(), _qualname(prop.func))
+    elif hasattr(prop, 'lhs'):
+        return '({} {} {})'.format(property_key(prop.lhs), type(prop).__name__, property_key(prop.rhs))
+    return _qualname(type(prop))
+
+def _key_hash(key):
+    return hashlib.sha1(key.encode()).hexdigest()
+
+class ResultCache:
+    '''The properties that passed, stored in the directory `path`
+
+    A property is identified by its :func:`property_key`, and a pass is recorded for a depth
+    along with the :func:`property_hash` of the property at the time.
+    Each entry is its own file, so properties run in parallel processes can record passes concurrently.
+
+    `source` is the function or (bound) PropertySet method the property was made by, if any
+    '''
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+
+    def _file(self, key, depth):
+        return os.path.join(self.path, '{}.{}'.format(_key_hash(key), depth))
+
+    def passed(self, prop, depth, source=None):
+        '''Whether `prop` passed at depth `depth` and is unchanged since
+        '''
+        try:
+            with open(self._file(property_key(prop, source), depth)) as f:
+                h, _, _ = f.read().partition('\n')
+        except OSError:
+            return False
+
+        return h == property_hash(prop, source)
+
+    def record(self, prop, depth, outcome, source=None):
+        '''Record the `outcome` of running `prop` to depth `depth`
+        '''
+        key = property_key(prop, source)
+        if not isinstance(outcome, clauses.Success):
+            try:
+                os.remove(self._file(key, depth))
+            except OSError:
+                pass
+            return
+
+        os.makedirs(self.path, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path)
+        with os.fdopen(fd, 'w') as f:
+            f.write('{}\n{}'.format(property_hash(prop, source), key))
+        os.replace(tmp, self._file(key, depth))
+
+    def invalidate(self, name=None, depth=None):
+        '''Forget the passes of the property called `name` at depth `depth`
+        or at any depth if `depth` is None, or of every property if `name` is None
+
+        `name` is its (module-)qualified name, or any dotted suffix of it, see :func:`property_key`
+        '''
+        if name is None:
+            shutil.rmtree(self.path, ignore_errors=True)
+            return
+
+        try:
+            files = os.listdir(self.path)
+        except OSError:
+            return
+
+        for fn in files:
+            _, _, d = fn.partition('.')
+            if not d or (depth is not None and d != str(depth)):
+                continue
+
+            fn = os.path.join(self.path, fn)
+            try:
+                with open(fn) as f:
+                    _, _, key = f.read().partition('\n')
+                if key == name or key.endswith('.' + name):
+                    os.remove(fn)
+            except OSError:
+                pass
+
+def invalidate(name=None, depth=None, path=DEFAULT_PATH):
+    '''Forget cached passes, see :meth:`ResultCache.invalidate`
+
+    >>> invalidate('prop_sorted')           # re-run prop_sorted next time
+    >>> invalidate('my_props.prop_sorted')  # only the one in my_props
+    >>> invalidate()                        # re-run everything
+    '''
+    ResultCache(path).invalidate(name, depth)
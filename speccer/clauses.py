@@ -1,28 +1,44 @@
 import abc
+import time
 import types
 import inspect
 import contextlib
+import collections
 
 from . import misc
+from . import runtime
 from . import typeable
 from . import strategy
+from . import compiled
+from . import sampling
+from . import shrinking
+from . import dedup
+from . import memo
 from . import asserts
 from . import _errors
 
-class Outcome(abc.ABC):
+class Outcome(metaclass=abc.ABCMeta):
+    __slots__ = ('prop', '_asserts', 'child_outcome', '_state')
+
     def __init__(self, prop, assertions, child_outcome=None):
         self.prop = prop
         self._asserts = assertions
-        self._extra_args = []
         self.child_outcome = child_outcome
+        self._state = None
 
-        # execution state
-        # for nice output
-        self.state = {
-            'calls': 0,
-            'depth': 0,
-            'failed_implications': 0,
-        }
+    @property
+    def state(self):
+        '''Execution state, for nice output
+
+        Only made when first asked for, as most outcomes are never printed
+        '''
+        if self._state is None:
+            self._state = {
+                'calls': 0,
+                'depth': 0,
+                'failed_implications': 0,
+            }
+        return self._state
 
     @property
     def assertions(self):
@@ -39,19 +55,27 @@ class Outcome(abc.ABC):
         or None
         '''
 
+    @property
+    def _extra_args(self):
+        return ()
+
     def __repr__(self):
-        if self._extra_args != []:
+        if self._extra_args:
             _extra = ', '.join(list(map(repr, self._extra_args)))
             return '<%s(%s, %s, %s)>' % (self.__class__.__name__, self.prop, self.reason, _extra)
 
         return '<%s(%s, %s)>' % (self.__class__.__name__, self.prop, self.reason)
 
 class Success(Outcome):
+    __slots__ = ()
+
     @property
     def reason(self):
         return 'N/A'
 
 class UnitSuccess(Success):
+    __slots__ = ()
+
     def __init__(self, clause):
         super().__init__(clause, [])
 
@@ -60,6 +84,8 @@ class UnitSuccess(Success):
         return '<unit>'
 
 class Witness(Success):
+    __slots__ = ('_witness',)
+
     def __init__(self, prop, witness, assertions=None, child_outcome=None):
         super().__init__(prop, assertions, child_outcome)
         self._witness = witness
@@ -69,6 +95,8 @@ class Witness(Success):
         return self._witness
 
 class Failure(Outcome):
+    __slots__ = ('_msg',)
+
     def __init__(self, prop, assertions=None, child_outcome=None, message='Unspecified Failure'):
         self._msg = message
         super().__init__(prop, assertions, child_outcome)
@@ -78,6 +106,8 @@ class Failure(Outcome):
         return self._msg
 
 class EmptyFailure(Failure):
+    __slots__ = ()
+
     def __init__(self, clause):
         super().__init__(clause, [])
 
@@ -87,9 +117,11 @@ class EmptyFailure(Failure):
 
 
 class NoWitness(Failure):
-    pass
+    __slots__ = ()
 
 class UnrelatedException(Failure):
+    __slots__ = ('_e',)
+
     def __init__(self, prop, exception, assertions=None, child_outcome=None):
         super().__init__(prop, assertions, child_outcome)
         self._e = exception
@@ -99,6 +131,8 @@ class UnrelatedException(Failure):
         return self._e
 
 class Counter(Failure):
+    __slots__ = ('_counter',)
+
     def __init__(self, prop, counter, assertions=None, child_outcome=None):
         super().__init__(prop, assertions, child_outcome)
         self._counter = counter
@@ -108,17 +142,35 @@ class Counter(Failure):
         return self._counter
 
 class AssertionCounter(Counter):
+    __slots__ = ()
+
     def __init__(self, prop, counter, msg, assertions=None, child_outcome=None):
         super().__init__(prop, counter, assertions=assertions, child_outcome=child_outcome)
         self._msg = msg
-        self._extra_args.append(msg)
 
     @property
     def message(self):
         return self._msg
 
+    @property
+    def _extra_args(self):
+        return (self._msg,)
+
 class NoCounter(Success):
-    pass
+    __slots__ = ()
+
+class CachedSuccess(Success):
+    '''The property was not run, as it passed before and is unchanged since
+    see :mod:`speccer.cache`
+    '''
+    __slots__ = ()
+
+    def __init__(self, prop):
+        super().__init__(prop, [])
+
+    @property
+    def reason(self):
+        return '<cached>'
 
 def _get_name_from_func(func, other):
     if not isinstance(func, types.LambdaType):
@@ -136,13 +188,19 @@ class Property:
     It represents a piece of computation that can be evaluated to a success or a failure
     '''
     def __init__(self, name=None):
-        self.path = misc.get_stack_path(i=1)
+        # where the property was made, as misc.get_stack_path(i=1) would name it
+        # only resolved when asked for, as nested properties are made once per outer case
+        self._stack = misc.StackPath(i=2)
         self.name = name or 'Unknown'
 
         # the Property can store its current, partially evaluated state
         # (assertions_log, counterexample/witness)
         self.partial = (None, None)
 
+    @property
+    def path(self):
+        return str(self._stack)
+
     @property
     def failed_implications(self):
         return None
@@ -208,6 +266,22 @@ class Quantified(Property):
         if getattr(self.type, '_failed_implications', False):
             self.type._failed_implications = 0
 
+    def run(self, depth):
+        return (yield from _evaluate(depth, self))
+
+    def _decide(self, depth, counter, log, passed, child_outcome=None, message=None, nested=False):
+        '''Decide the outcome of this property after the case `counter`
+        which passed (or failed, with an assertion `message`) having made the assertions in `log`
+        `nested` is True if this property is in a case of another, see :func:`_not_shrinking`
+
+        Returns None if more cases are needed
+        '''
+        raise NotImplementedError
+
+    def _exhausted(self, log):
+        '''The outcome of this property after all cases were tried without deciding it
+        '''
+        raise NotImplementedError
 
 class empty(Property):
     '''The empty property
@@ -241,46 +315,261 @@ class unit(Property):
         yield
         return UnitSuccess(self)
 
-def _run_prop_func(depth, prop, type, f):
-    '''Runs a property's function with argument of type `type`
+def _values(depth, type):
+    '''The values of `type` to quantify over
+    '''
+    rt = runtime.CURRENT
+    if rt.samples is not None:
+        values = sampling.sample(depth, type, rt.samples, rt.random)
+    elif rt.compiled:
+        values = compiled.values(depth, type)
+    else:
+        values = strategy.Strategy[type](depth)
 
-    If the property holds,   returns Witness(prop, WITNESS)
-    If it does not hold,     returns Counter(prop, COUNTER)
-    If an assertion happens, returns AssertionCounter(prop, COUNTER, EXCEPTION)
+    if rt.dedup:
+        return _unique(values)
+
+    return values
+
+def _unique(values):
+    '''The `values` not seen before, counting those skipped in the current runtime
     '''
-    sig = inspect.signature(f)
-    for v in strategy.Strategy[type](depth):
-        counter = sig.bind(v)
+    seen = dedup.Seen()
+    for v in values:
+        if seen.add(v):
+            yield v
+        else:
+            runtime.CURRENT.duplicates += 1
 
-        log = []
-        prop.partial = (log, counter)
+def _run_prop_value(depth, prop, sig, f, v):
+    '''Runs a property's function `f` (with signature `sig`) on the value `v`
 
-        try:
-            with asserts.change_assertions_log(log):
-                v = f(*counter.args, **counter.kwargs)
-
-            # TODO: decide between returning True/False
-            # returning None
-            # or combination + assertions to be failure/pass
-            if v is False:
-                yield counter, Counter(prop, counter, assertions=log)
-            elif isinstance(v, Property):
-                c = v.run(depth)
+    Returns (counter, outcome) where outcome is a Witness or (Assertion)Counter for `v`
+    or None if `v` failed an assumption
+
+    If `f` is :func:`memo.pure` the result is looked up in its memo table first,
+    an outcome found there has no child_outcome
+    '''
+    table = getattr(f, '__memo__', None)
+    if table is None:
+        return _eval_prop_value(depth, prop, sig, f, v)
+
+    # the table is f's own, so only the value needs to be in the key
+    key = ('run', depth, dedup.fingerprint(v))
+    found, out = table.lookup(key)
+    if found:
+        if out is None:
+            return None
+
+        counter, cls, assertions, msg = out
+        prop.partial = (assertions, counter)
+        if cls is AssertionCounter:
+            return counter, AssertionCounter(prop, counter, msg, assertions=assertions)
+        return counter, cls(prop, counter, assertions=assertions)
+
+    out = _eval_prop_value(depth, prop, sig, f.__wrapped__, v)
+    if out is None:
+        table.store(key, None)
+    else:
+        # only what is needed to make the outcome again, not the outcome itself
+        # which would keep its Property (and those of every child outcome) alive
+        counter, outcome = out
+        msg = outcome.message if isinstance(outcome, AssertionCounter) else None
+        table.store(key, (counter, type(outcome), outcome.assertions, msg))
+    return out
+
+def _eval_prop_value(depth, prop, sig, f, v):
+    counter = sig.bind(v)
+
+    log = []
+    prop.partial = (log, counter)
+
+    try:
+        with asserts.change_assertions_log(log):
+            v = f(*counter.args, **counter.kwargs)
+
+        # TODO: decide between returning True/False
+        # returning None
+        # or combination + assertions to be failure/pass
+        if v is False:
+            return counter, Counter(prop, counter, assertions=log)
+        elif isinstance(v, Property):
+            c = v.run(depth)
+            with _not_shrinking():
                 try:
                     while True:
                         next(c)
                 except StopIteration as e:
-                    if isinstance(e.value, Success):
-                        yield counter, Witness(prop, counter, assertions=log, child_outcome=e.value)
-                    else:
-                        yield counter, Counter(prop, counter, assertions=log, child_outcome=e.value)
+                    child = e.value
+
+            if isinstance(child, Success):
+                return counter, Witness(prop, counter, assertions=log, child_outcome=child)
             else:
-                yield counter, Witness(prop, counter, assertions=log)
-        except AssertionError as e:
-            msg = e.args[0] if len(e.args) > 0 else '<no message>'
-            yield counter, AssertionCounter(prop, counter, msg, assertions=log)
-        except _errors.FailedAssumption as e:
-            print('failed assumption!')
+                return counter, Counter(prop, counter, assertions=log, child_outcome=child)
+        else:
+            return counter, Witness(prop, counter, assertions=log)
+    except AssertionError as e:
+        msg = e.args[0] if len(e.args) > 0 else '<no message>'
+        return counter, AssertionCounter(prop, counter, msg, assertions=log)
+    except _errors.FailedAssumption as e:
+        print('failed assumption!')
+
+def _shrink(depth, prop, counter):
+    '''Shrink the counterexample `counter` to the forall property `prop`
+
+    Returns (shrink, counter, outcome) for the smallest counterexample found
+    Candidates that raise (other than with a failed assertion) are not counterexamples of this
+    failure, so are skipped rather than ending the run
+    '''
+    sig = inspect.signature(prop.func)
+
+    def fails(v):
+        try:
+            out = _run_prop_value(depth, prop, sig, prop.func, v)
+        except Exception:
+            return False
+        return out is not None and isinstance(out[1], Failure)
+
+    v = _bound_value(counter)
+    rt = runtime.CURRENT
+    shrunk = shrinking.shrink(depth, prop.type.typ, v, fails, budget=rt.shrink_budget)
+
+    # re-run the smallest counterexample, so the property (and any nested ones)
+    # are left in the state of that counterexample rather than the last one tried
+    out = _run_prop_value(depth, prop, sig, prop.func, shrunk.value)
+    if out is None:
+        # it failed an assumption this time, so keep the original counterexample
+        return None, counter, Counter(prop, counter, assertions=[])
+
+    counter, outcome = out
+    return shrunk, counter, outcome
+
+def _bound_value(counter):
+    '''The value `v` that `counter` = sig.bind(v) bound
+    '''
+    name, v = next(iter(counter.arguments.items()))
+    if counter.signature.parameters[name].kind == inspect.Parameter.VAR_POSITIONAL:
+        v, = v
+    return v
+
+@contextlib.contextmanager
+def _not_shrinking():
+    '''Do not shrink counterexamples while running properties nested in a case of another
+
+    They are ran again for every case (and shrink candidate) of the outer property,
+    so only the counterexample to the outermost property is shrunk
+    '''
+    rt = runtime.CURRENT
+    shrink, rt.shrink = rt.shrink, False
+    try:
+        yield
+    finally:
+        rt.shrink = shrink
+
+class _Frame:
+    '''A quantified property part way through being evaluated by :func:`_evaluate`
+    '''
+    __slots__ = ('prop', 'sig', 'values', 'counter', 'log')
+
+    def __init__(self, depth, prop):
+        self.prop = prop
+        self.sig = inspect.signature(prop.func)
+        self.values = iter(_values(depth, prop.type))
+        self.counter = None
+        self.log = []
+
+def _evaluate(depth, root):
+    '''Evaluates the quantified property `root`, yielding the counter for each of its values
+
+    A quantified property returned by the property function is not ran (and drained) recursively,
+    but pushed onto an explicit stack of :class:`_Frame`'s and evaluated in place, its outcome
+    passed back to the case of the frame below when it finishes.
+    Outcome objects are only made when a frame finishes, see Quantified._decide
+    '''
+    stack = [_Frame(depth, root)]
+    child = None
+    while True:
+        frame = stack[-1]
+        prop = frame.prop
+        nested = len(stack) > 1
+        case = True
+
+        if child is not None:
+            # the nested property of this frame's current case has finished
+            outcome = prop._decide(depth, frame.counter, frame.log, isinstance(child, Success),
+                                   child_outcome=child, nested=nested)
+            child = None
+        else:
+            stats = runtime.CURRENT.stats
+            if stats is not None:
+                t = time.perf_counter()
+
+            try:
+                v = next(frame.values)
+            except StopIteration:
+                outcome = prop._exhausted(frame.log)
+                case = False
+            else:
+                if stats is not None:
+                    stats.generate_time += time.perf_counter() - t
+
+                frame.counter = counter = frame.sig.bind(v)
+                frame.log = log = []
+                prop.partial = (log, counter)
+
+                if hasattr(prop.func, '__memo__'):
+                    out = _run_prop_value(depth, prop, frame.sig, prop.func, v)
+                    if out is None:
+                        continue
+
+                    frame.counter, r = out
+                    frame.log = r.assertions
+                    msg = r.message if isinstance(r, AssertionCounter) else None
+                    outcome = prop._decide(depth, frame.counter, frame.log, isinstance(r, Success),
+                                           child_outcome=r.child_outcome, message=msg, nested=nested)
+                else:
+                    if stats is not None:
+                        t = time.perf_counter()
+
+                    try:
+                        with asserts.change_assertions_log(log):
+                            r = prop.func(*counter.args, **counter.kwargs)
+                    except AssertionError as e:
+                        msg = e.args[0] if len(e.args) > 0 else '<no message>'
+                        outcome = prop._decide(depth, counter, log, False, message=msg, nested=nested)
+                    except _errors.FailedAssumption as e:
+                        print('failed assumption!')
+                        continue
+                    else:
+                        if stats is not None:
+                            stats.predicate_time += time.perf_counter() - t
+
+                        if isinstance(r, Quantified):
+                            stack.append(_Frame(depth, r))
+                            continue
+                        elif isinstance(r, Property):
+                            c = r.run(depth)
+                            with _not_shrinking():
+                                try:
+                                    while True:
+                                        next(c)
+                                except StopIteration as e:
+                                    child = e.value
+                            continue
+
+                        # TODO: decide between returning True/False
+                        # returning None
+                        # or combination + assertions to be failure/pass
+                        outcome = prop._decide(depth, counter, log, r is not False, nested=nested)
+
+        if case and len(stack) == 1:
+            yield frame.counter
+
+        if outcome is not None:
+            stack.pop()
+            if not stack:
+                return outcome
+            child = outcome
 
 class forall(Quantified):
     '''Universal quantification
@@ -294,20 +583,25 @@ class forall(Quantified):
     def __init__(self, type, func, name=None):
         super().__init__(type, func, name, quant_name='forall')
 
-    def run(self, depth):
-        # run_prop_func just runs the property's func, which is exactly all forall clauses does
-        # so there's no required extra step here.
-        assertions = []
-        for c, v in _run_prop_func(depth, self, self.type, self.func):
-            yield c
+    def _decide(self, depth, counter, log, passed, child_outcome=None, message=None, nested=False):
+        if passed:
+            return None
 
+        if runtime.CURRENT.shrink and not nested:
+            shrunk, counter, v = _shrink(depth, self, counter)
             if isinstance(v, AssertionCounter):
-                return v
-            if isinstance(v, Failure):
-                return Counter(self, c, assertions=v.assertions, child_outcome=v.child_outcome)
-            assertions = v.assertions
+                out = v
+            else:
+                out = Counter(self, counter, assertions=v.assertions, child_outcome=v.child_outcome)
+            out.state['shrink'] = shrunk
+        elif message is not None:
+            out = AssertionCounter(self, counter, message, assertions=log)
+        else:
+            out = Counter(self, counter, assertions=log, child_outcome=child_outcome)
+        return out
 
-        return NoCounter(self, assertions=assertions)
+    def _exhausted(self, log):
+        return NoCounter(self, assertions=log)
 
 class exists(Quantified):
     '''Existential quantification
@@ -321,25 +615,95 @@ class exists(Quantified):
     def __init__(self, type, func, name=None):
         super().__init__(type, func, name, quant_name='exists')
 
-    def run(self, depth):
-        # run_prop_func just runs the property's func, which is exactly all an exists clause does
-        # so there's no required extra step here.
-        for c, v in _run_prop_func(depth, self, self.type, self.func):
-            yield c
+    def _decide(self, depth, counter, log, passed, child_outcome=None, message=None, nested=False):
+        if message is not None:
+            return AssertionCounter(self, counter, message, assertions=log)
+        if passed:
+            # TODO: Some Conversion Method
+            return Witness(self, counter, assertions=log, child_outcome=child_outcome)
+        return None
 
-            if isinstance(v, AssertionCounter):
-                return v
-            if isinstance(v, Success):
-                # TODO: Some Conversion Method
-                return Witness(self, c, assertions=v.assertions, child_outcome=v.child_outcome)
+    def _exhausted(self, log):
+        return NoWitness(self, assertions=log)
+
+# cost key -> [total seconds, cases] measured over previous runs
+# when the runtime orders properties by cost, see _cost_key
+_COSTS = {}
+
+def _cost_key(prop):
+    '''What the cost of `prop` is recorded against
+
+    The code of its functions rather than the Property itself, as nested properties
+    are made again for every outer case, and every property again for each spec()
+    '''
+    if isinstance(prop, Quantified):
+        f = getattr(prop.func, '__wrapped__', prop.func)
+        return (type(prop), getattr(f, '__code__', f))
+    elif isinstance(prop, (_and, _or)):
+        return (type(prop), _cost_key(prop.lhs), _cost_key(prop.rhs))
+    return type(prop)
+
+def _case_cost(prop):
+    '''The mean time per case of previous runs of `prop`
+    '''
+    total, n = _COSTS.get(_cost_key(prop), (0.0, 0))
+    return total / n if n else 0.0
 
-        return NoWitness(self, assertions=v.assertions)
+def _run_timed(prop, depth):
+    '''Runs `prop`, adding the time taken for each case to its cost
+    '''
+    cost = _COSTS.setdefault(_cost_key(prop), [0.0, 0])
+    g = prop.run(depth)
+    while True:
+        t = time.perf_counter()
+        try:
+            c = next(g)
+        except StopIteration as e:
+            return e.value
+        finally:
+            cost[0] += time.perf_counter() - t
+
+        cost[1] += 1
+        yield c
+
+def _run_either(depth, lhs, rhs, decides):
+    '''Runs lhs and rhs, yielding at each step of either,
+    until one returns an outcome that `decides` the combined outcome, which is returned
+    if neither does, then returns the outcome of rhs
+
+    By default calls to run(...) on lhs and rhs are interspersed,
+    if the runtime orders by cost then the side with the cheapest cases is ran first
+    and the other only if that did not decide the outcome
+    '''
+    outs = {}
+
+    if runtime.CURRENT.cost_order:
+        for p in sorted([lhs, rhs], key=_case_cost):
+            out = outs[p] = yield from _run_timed(p, depth)
+            if decides(out):
+                return out
+        return outs[rhs]
+
+    gens = collections.deque([(lhs, lhs.run(depth)), (rhs, rhs.run(depth))])
+    while gens:
+        p, g = gens.popleft()
+        try:
+            c = next(g)
+        except StopIteration as e:
+            out = outs[p] = e.value
+            if decides(out):
+                return out
+            continue
+
+        gens.append((p, g))
+        yield c
 
+    return outs[rhs]
 
 class _or(Property):
     '''p | q, interspereses calls to run(...) on p and q
-    returning any Success in p or q
-    if no success, then returns the last outcome that was ran
+    returning the first Success in p or q as soon as it is found
+    if no success, then returns the outcome of q
     '''
     def __init__(self, a, b):
         super().__init__(name='({} or {})'.format(a.name, b.name))
@@ -347,20 +711,12 @@ class _or(Property):
         self.rhs = b
 
     def run(self, depth):
-        g = misc.intersperse([self.lhs.run(depth), self.rhs.run(depth)])
-        while True:
-            try:
-                yield next(g)
-            except StopIteration as e:
-                for v in e.value:
-                    if isinstance(v, Success):
-                        return v
-                return v
+        return (yield from _run_either(depth, self.lhs, self.rhs, lambda v: isinstance(v, Success)))
 
 class _and(Property):
     '''p & q, interspereses calls to run(...) on p and q
-    returning any Failure in p or q
-    if no failure, then returns the last outcome that was ran
+    returning the first Failure in p or q as soon as it is found
+    if no failure, then returns the outcome of q
     '''
     def __init__(self, a, b):
         super().__init__(name='({} and {})'.format(a.name, b.name))
@@ -368,12 +724,4 @@ class _and(Property):
         self.rhs = b
 
     def run(self, depth):
-        g = misc.intersperse([self.lhs.run(depth), self.rhs.run(depth)])
-        while True:
-            try:
-                yield next(g)
-            except StopIteration as e:
-                for v in e.value:
-                    if isinstance(v, Failure):
-                        return v
-                return v
+        return (yield from _run_either(depth, self.lhs, self.rhs, lambda v: isinstance(v, Failure)))
@@ -0,0 +1,200 @@
+# compiled.py - Compiling strategies for built-in types into flat generators
+import logging
+import itertools
+
+from . import _errors
+from . import typeable
+from . import strategy
+from . import default_strategies as ds
+from .misc import intersperse
+
+log = logging.getLogger('compiled')
+
+__all__ = [
+    'compile_strategy',
+]
+
+# compiled generators, keyed on strategy._cache_key(t)
+# cleared whenever a strategy is registered
+_compiled = {}
+strategy.register_cache(_compiled)
+
+# Each compiled generator is a function `depth -> iterator' yielding exactly
+# the same values in the same order as `Strategy[t](depth)' would, but without
+# the StrategyIterator, generation graph or keyword dispatch for each value.
+#
+# As with StrategyIterator, a depth of 0 or less yields nothing.
+
+def _nat(depth):
+    if depth > 0:
+        yield from range(depth + 1)
+
+def _neg(depth):
+    if depth > 0:
+        for i in range(depth + 1):
+            yield -i
+
+def _int(depth):
+    if depth > 0:
+        yield 0
+        for i in range(1, depth + 1):
+            yield i
+            yield -i
+
+def _word(n):
+    def _wordn(depth):
+        if depth > 0:
+            yield from range(min(depth, 2**n))
+    return _wordn
+
+def _str(depth):
+    if depth > 0:
+        yield from ds.LETTERS[:min(depth + 1, len(ds.LETTERS))]
+
+def _bool(depth):
+    if depth > 0:
+        yield False
+        yield True
+
+def _none(depth):
+    if depth > 0:
+        yield None
+
+def _list(elem):
+    def _list_gen(depth):
+        '''Lists in the same order as ListStrat
+
+        ListStrat yields [] then [x] + xs for each x at depth d and xs at depth d-1,
+        which is a pre-order walk of the tree of prefixes, here done with an explicit
+        stack of element iterators rather than a tower of nested strategies.
+
+        A prefix of length k is only yielded if depth - k > 0.
+        '''
+        if depth <= 0:
+            return
+
+        yield []
+
+        prefix = []
+        stack = [elem(depth)] if depth - 1 > 0 else []
+        while stack:
+            try:
+                x = next(stack[-1])
+            except StopIteration:
+                stack.pop()
+                if prefix:
+                    prefix.pop()
+                continue
+
+            prefix.append(x)
+            yield list(prefix)
+
+            k = len(prefix)
+            if depth - k - 1 > 0:
+                stack.append(elem(depth - k))
+            else:
+                prefix.pop()
+    return _list_gen
+
+def _set(elem):
+    def _set_gen(depth):
+        if depth <= 0:
+            return
+
+        alls = list(elem(depth))
+        for n in range(depth):
+            for p in itertools.combinations(alls, n):
+                yield set(p)
+    return _set_gen
+
+def _permutations(elem):
+    def _permutations_gen(depth):
+        if depth > 0:
+            yield from itertools.permutations(elem(depth))
+    return _permutations_gen
+
+def _tuple(*elems):
+    def _tuple_gen(depth):
+        if depth > 0:
+            yield from strategy.generate_args_from_strategies(*(e(depth) for e in elems))
+    return _tuple_gen
+
+def _union(*elems):
+    def _union_gen(depth):
+        if depth > 0:
+            yield from intersperse(e(depth) for e in elems)
+    return _union_gen
+
+def _missing(t):
+    def _missing_gen(depth):
+        raise _errors.MissingStrategyError('Cannot get Strategy instance for ~{}'.format(t))
+        yield
+    return _missing_gen
+
+def _fallback(strat):
+    def _strategy_gen(depth):
+        return iter(strat(depth))
+    return _strategy_gen
+
+LEAVES = {
+    ds.NatStrat: _nat,
+    ds.NegStrat: _neg,
+    ds.IntStrat: _int,
+    ds.Word2Strat: _word(2),
+    ds.Word4Strat: _word(4),
+    ds.Word8Strat: _word(8),
+    ds.StrStrat: _str,
+    ds.BoolStrat: _bool,
+    ds.NoneStrat: _none,
+}
+
+CONSTRUCTORS = {
+    ds.ListStrat: _list,
+    ds.SetStrat: _set,
+    ds.PermutationsStrat: _permutations,
+    ds.TupleStrat: _tuple,
+    ds.UnionStrat: _union,
+}
+
+def _compile(t):
+    try:
+        strat = strategy.get_strat_instance(t)
+    except _errors.MissingStrategyError:
+        return _missing(t)
+
+    if strat in LEAVES:
+        return LEAVES[strat]
+
+    # only a strategy generated for a type constructor itself,
+    # not one derived from it (e.g. by ops.mapS) which inherits the attribute
+    origin = vars(strat).get('__generated_from__')
+    if origin in CONSTRUCTORS:
+        typ = typeable.from_type(t)
+        return CONSTRUCTORS[origin](*(compile_strategy(a.typ) for a in typ.args))
+
+    # a user-defined strategy, run it as usual
+    return _fallback(strat)
+
+def compile_strategy(t):
+    '''Compile the strategy for type `t` into a generator function
+
+    Walks the type once, built-in types and type constructors (List, Tuple, Set, Union, ...)
+    become flat generators, any other strategy is run as normal
+
+    >>> gen = compile_strategy(List[Tuple[int, Union[str, bool]]])
+    >>> list(gen(3)) == list(Strategy[List[Tuple[int, Union[str, bool]]]](3))
+    True
+    '''
+    try:
+        key = strategy._cache_key(t)
+        return _compiled[key]
+    except TypeError:
+        return _compile(t)
+    except KeyError:
+        gen = _compiled[key] = _compile(t)
+        return gen
+
+def values(depth, t):
+    '''As :func:`ops.values` but using the compiled strategy for `t`
+    '''
+    return compile_strategy(t)(depth)
@@ -0,0 +1,83 @@
+# dedup.py - Remembering which values have already been tested
+import math
+
+__all__ = [
+    'fingerprint',
+    'Seen',
+]
+
+def fingerprint(v):
+    '''A hashable fingerprint of the value `v`
+
+    Equal values of the same type have equal fingerprints, including unhashable
+    lists, sets and dicts. The type is part of the fingerprint so that e.g. 0 and False differ.
+    Other unhashable values are fingerprinted by their repr()
+    '''
+    t = type(v)
+    if t is list or t is tuple:
+        return (t,) + tuple(map(fingerprint, v))
+    elif t is set or t is frozenset:
+        return (t, frozenset(map(fingerprint, v)))
+    elif t is dict:
+        return (t, frozenset((fingerprint(k), fingerprint(x)) for k, x in v.items()))
+
+    try:
+        hash(v)
+    except TypeError:
+        return (t, repr(v))
+
+    return (t, v)
+
+class BloomFilter:
+    '''A fixed-size set of hashable values, which may wrongly report a value as present
+
+    Sized to hold `capacity` values with a false positive rate of about `error`
+    '''
+    def __init__(self, capacity, error):
+        self.size = max(8, int(-capacity * math.log(error) / math.log(2)**2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _indices(self, x):
+        for i in range(self.hashes):
+            yield hash((i, x)) % self.size
+
+    def __contains__(self, x):
+        return all(self._bits[j >> 3] & (1 << (j & 7)) for j in self._indices(x))
+
+    def add(self, x):
+        for j in self._indices(x):
+            self._bits[j >> 3] |= 1 << (j & 7)
+
+class Seen:
+    '''The set of values seen so far, bounded in memory
+
+    The first `exact` fingerprints are kept exactly, after that they go into a :class:`BloomFilter`
+    holding `capacity` more with false positive rate `error`, so a value never seen before may
+    (rarely) be reported as a duplicate
+    '''
+    def __init__(self, exact=2**16, capacity=2**20, error=1e-6):
+        self._exact = set()
+        self._max_exact = exact
+        self._capacity = capacity
+        self._error = error
+        self._bloom = None
+
+    def add(self, v):
+        '''Add `v`, returning True if it had not been seen before
+        '''
+        fp = fingerprint(v)
+        if fp in self._exact:
+            return False
+
+        if len(self._exact) < self._max_exact:
+            self._exact.add(fp)
+            return True
+
+        if self._bloom is None:
+            self._bloom = BloomFilter(self._capacity, self._error)
+        elif fp in self._bloom:
+            return False
+
+        self._bloom.add(fp)
+        return True
@@ -4,7 +4,7 @@ import logging
 import collections
 
 from .strategy import Strategy
-from .misc import intersperse
+from .misc import intersperse, binomial
 from . import strategy
 from . import ops
 from . import _types
@@ -13,11 +13,24 @@ from .helper import HAS_TYPING
 LETTERS = string.ascii_lowercase
 log = logging.getLogger('default_strategies')
 
+def _index(k, n):
+    '''Check that `k` is a valid index into `n` values
+    '''
+    if not 0 <= k < n:
+        raise IndexError(k)
+
 class NatStrat(Strategy[_types.Nat]):
     def generate(self, depth):
         for i in range(depth + 1):
             yield i
 
+    def count(self, depth):
+        return depth + 1
+
+    def nth(self, depth, k):
+        _index(k, depth + 1)
+        return k
+
 class IntStrat(Strategy[int]):
     def generate(self, depth):
         yield 0
@@ -26,6 +39,15 @@ class IntStrat(Strategy[int]):
             yield i
             yield -i
 
+    def count(self, depth):
+        return 2*depth + 1
+
+    def nth(self, depth, k):
+        _index(k, 2*depth + 1)
+        if k % 2:
+            return (k + 1) // 2
+        return -(k // 2)
+
 class Word2Strat(Strategy[_types.Word2]):
     def generate(self, depth):
         yield 0
@@ -33,6 +55,13 @@ class Word2Strat(Strategy[_types.Word2]):
         for i in range(1, min(depth, 2**2)):
             yield i
 
+    def count(self, depth):
+        return min(depth, 2**2)
+
+    def nth(self, depth, k):
+        _index(k, min(depth, 2**2))
+        return k
+
 class Word4Strat(Strategy[_types.Word4]):
     def generate(self, depth):
         yield 0
@@ -40,6 +69,13 @@ class Word4Strat(Strategy[_types.Word4]):
         for i in range(1, min(depth, 2**4)):
             yield i
 
+    def count(self, depth):
+        return min(depth, 2**4)
+
+    def nth(self, depth, k):
+        _index(k, min(depth, 2**4))
+        return k
+
 class Word8Strat(Strategy[_types.Word8]):
     def generate(self, depth):
         yield 0
@@ -47,6 +83,13 @@ class Word8Strat(Strategy[_types.Word8]):
         for i in range(1, min(depth, 2**8)):
             yield i
 
+    def count(self, depth):
+        return min(depth, 2**8)
+
+    def nth(self, depth, k):
+        _index(k, min(depth, 2**8))
+        return k
+
 if HAS_TYPING:
     import typing
 
@@ -62,6 +105,32 @@ if HAS_TYPING:
                 for xs in Strategy[typing.List[t]](depth - 1, *args, **kws):
                     yield [x] + xs
 
+        def count(self, depth, t):
+            # [] then [x] + xs for each of the count(d, t) x's and count(d - 1, List[t]) xs's
+            n = 0
+            for d in range(1, depth + 1):
+                c = ops.count(d, t)
+                if c is None:
+                    return None
+                n = 1 + c*n
+            return n
+
+        def nth(self, depth, k, t):
+            n = self.count(depth, t)
+            if n is None:
+                return super().nth(depth, k, t)
+
+            _index(k, n)
+            xs = []
+            for d in range(depth, 0, -1):
+                if k == 0:
+                    break
+
+                # the values after [] come in blocks of count(d - 1, List[t]), one per x
+                i, k = divmod(k - 1, self.count(d - 1, t))
+                xs.append(ops.nth(d, t, i))
+            return xs
+
     class SetStrat(Strategy[typing.Set]):
         '''TODO: make generation less strict'''
         def generate(self, depth, t, *args, **kwargs):
@@ -71,28 +140,136 @@ if HAS_TYPING:
                 for p in itertools.combinations(alls, n):
                     yield set(p)
 
+        def count(self, depth, t):
+            c = ops.count(depth, t)
+            if c is None:
+                return None
+            return sum(binomial(c, n) for n in range(depth))
+
+        def nth(self, depth, k, t):
+            c = ops.count(depth, t)
+            if c is None:
+                return super().nth(depth, k, t)
+
+            _index(k, self.count(depth, t))
+            n = 0
+            while k >= binomial(c, n):
+                k -= binomial(c, n)
+                n += 1
+
+            # the k-th combination of n of the c values, in itertools.combinations order
+            p = set()
+            i = 0
+            for r in range(n, 0, -1):
+                while k >= binomial(c - i - 1, r - 1):
+                    k -= binomial(c - i - 1, r - 1)
+                    i += 1
+                p.add(ops.nth(depth, t, i))
+                i += 1
+            return p
+
     class TupleStrat(Strategy[typing.Tuple]):
         def generate(self, depth, *ts, **kwargs):
             yield from ops.value_args(depth, *ts, **kwargs)
 
+        def count(self, depth, *ts):
+            n = 1
+            for t in ts:
+                c = ops.count(depth, t)
+                if c is None:
+                    return None
+                n *= c
+            return n
+
+        def nth(self, depth, k, *ts):
+            '''The k-th tuple, made from the nth values of each element type
+
+            The index tuples are still walked up to the k-th with :func:`strategy.product_indices`,
+            as the order generate_args_from_strategies uses comes from PairGen's priority queue
+            and has no closed form, so this is O(k) in index tuples (but builds no values)
+            '''
+            n = self.count(depth, *ts)
+            if n is None:
+                return super().nth(depth, k, *ts)
+
+            _index(k, n)
+            counts = [ops.count(depth, t) for t in ts]
+            idxs = next(itertools.islice(strategy.product_indices(*counts), k, None))
+            return tuple(ops.nth(depth, t, i) for t, i in zip(ts, idxs))
+
     class UnionStrat(Strategy[typing.Union]):
         def generate(self, depth, *ts, **kwargs):
             yield from intersperse(Strategy[t](depth, **kwargs) for t in ts)
 
+        def count(self, depth, *ts):
+            counts = [ops.count(depth, t) for t in ts]
+            if None in counts:
+                return None
+            return sum(counts)
+
+        def nth(self, depth, k, *ts):
+            counts = [ops.count(depth, t) for t in ts]
+            if None in counts:
+                return super().nth(depth, k, *ts)
+
+            _index(k, sum(counts))
+
+            # values are taken round-robin from each t until it runs out
+            live = [i for i, c in enumerate(counts) if c > 0]
+            r = 0
+            while True:
+                m = min(counts[i] for i in live) - r
+                if k < m*len(live):
+                    j, i = divmod(k, len(live))
+                    return ops.nth(depth, ts[live[i]], r + j)
+
+                k -= m*len(live)
+                r += m
+                live = [i for i in live if counts[i] > r]
+
 class StrStrat(Strategy[str]):
     def generate(self, depth):
         m = min(depth + 1, len(LETTERS))
         yield from LETTERS[:m]
 
+    def count(self, depth):
+        return min(depth + 1, len(LETTERS))
+
+    def nth(self, depth, k):
+        _index(k, self.count(depth))
+        return LETTERS[k]
+
 class BoolStrat(Strategy[bool]):
     def generate(self, _):
         yield False
         yield True
 
+    def count(self, _):
+        return 2
+
+    def nth(self, _, k):
+        _index(k, 2)
+        return bool(k)
+
 class NoneStrat(Strategy[None]):
     def generate(self, _):
         yield None
 
-@ops.mapS(Strategy[_types.Nat], register_type=_types.Neg)
-def MappedStrat(depth, value):
-    yield -value
+    def count(self, _):
+        return 1
+
+    def nth(self, _, k):
+        _index(k, 1)
+        return None
+
+class NegStrat(Strategy[_types.Neg]):
+    def generate(self, depth):
+        for i in range(depth + 1):
+            yield -i
+
+    def count(self, depth):
+        return depth + 1
+
+    def nth(self, depth, k):
+        _index(k, depth + 1)
+        return -k
@@ -0,0 +1,57 @@
+# instrument.py - Counters for where a spec run spends its time
+import attr
+
+import time
+import functools
+import collections
+
+from . import runtime
+
+__all__ = [
+    'Stats',
+]
+
+@attr.s
+class Stats:
+    '''Counters collected during a :func:`spec.spec` run with instrument=True
+    and returned in the outcome's state['stats']
+
+    - Stats.cases, Stats.elapsed: cases ran by the property, and the time it took
+    - Stats.generate_time: time spent generating the values of quantified properties
+    - Stats.predicate_time: time spent in the property functions (including assertions)
+    - Stats.assertion_time, Stats.assertions: time spent in, and calls to, the speccer.asserts helpers
+    - Stats.strategy_values, Stats.strategy_time: per strategy class name,
+        the number of values it generated and the time spent generating them (including any strategies it uses)
+    - Stats.pairgen_max_heap: the largest the PairGen priority queue got when generating tuples
+    '''
+    cases = attr.ib(default=0)
+    elapsed = attr.ib(default=0.0)
+    generate_time = attr.ib(default=0.0)
+    predicate_time = attr.ib(default=0.0)
+    assertion_time = attr.ib(default=0.0)
+    assertions = attr.ib(default=0)
+    strategy_values = attr.ib(default=attr.Factory(collections.Counter))
+    strategy_time = attr.ib(default=attr.Factory(collections.Counter))
+    pairgen_max_heap = attr.ib(default=0)
+
+    @property
+    def cases_per_sec(self):
+        return self.cases / self.elapsed if self.elapsed > 0 else None
+
+def timed_assertion(f):
+    '''Decorate an assertion helper `f` to count its calls and time
+    in the current runtime's :class:`Stats`, if there are any
+    '''
+    @functools.wraps(f)
+    def wrapper(*args, **kwargs):
+        stats = runtime.CURRENT.stats
+        if stats is None:
+            return f(*args, **kwargs)
+
+        t = time.perf_counter()
+        try:
+            return f(*args, **kwargs)
+        finally:
+            stats.assertion_time += time.perf_counter() - t
+            stats.assertions += 1
+    return wrapper
@@ -0,0 +1,243 @@
+# linearizable.py - Checking concurrent executions of a Model against its sequential spec
+import attr
+
+import sys
+import copy
+import logging
+import itertools
+import threading
+import collections
+
+from . import asserts
+from ._errors import NotLinearizable
+
+log = logging.getLogger('linearizable')
+
+__all__ = [
+    'check_linearizable',
+    'assert_linearizable',
+]
+
+@attr.s
+class Operation:
+    '''A single command invocation in a concurrent history
+
+    `call' and `ret' are positions in the global event order
+    '''
+    thread = attr.ib()
+    partial = attr.ib()
+    args = attr.ib()
+    call = attr.ib(default=None)
+    ret = attr.ib(default=None)
+    result = attr.ib(default=None)
+
+    def __str__(self):
+        return '[t{}] {} -> {!r}'.format(self.thread, self.partial, self.result)
+
+@attr.s
+class LinearizabilityResult:
+    linearizable = attr.ib()
+    split = attr.ib(default=None)
+    history = attr.ib(default=None)
+
+    @property
+    def pretty(self):
+        if self.history is None:
+            return '<linearizable>'
+
+        ops = sorted(self.history, key=lambda op: op.call)
+        return '\n> '.join(map(str, ops))
+
+def splits(n, k):
+    '''All assignments of `n' operations to at most `k' threads
+
+    Thread ids are numbered in order of first use so that assignments that only
+    differ by renaming threads are enumerated once, in a deterministic order.
+
+    >>> list(splits(2, 2))
+    [(0, 0), (0, 1)]
+    '''
+    def _go(prefix, used):
+        if len(prefix) == n:
+            yield tuple(prefix)
+            return
+
+        for t in range(min(used + 1, k)):
+            yield from _go(prefix + [t], max(used, t + 1))
+
+    yield from _go([], 0)
+
+_REJECTED = object()
+
+# held while the switch interval is lowered by _execute, as it is process-wide
+# so that concurrent checks do not restore each other's lowered interval
+_SWITCH_INTERVAL_LOCK = threading.Lock()
+
+def _prefix_length(partials):
+    '''The sequential prefix must bind every name used by the concurrent suffix
+    '''
+    from .model import NamedPartial
+
+    n = 0
+    for i, p in enumerate(partials):
+        if isinstance(p, NamedPartial):
+            n = i + 1
+    return n
+
+def _run_prefix(partials, n):
+    '''Run the first `n' partials sequentially, returning the Partials object
+    holding the environment and model state, or None if the prefix is invalid
+    '''
+    prefix = partials.__class__(partials.model.__class__(), partials[:n])
+    if not prefix.is_valid():
+        return None
+    return prefix
+
+def _execute(prefix, suffix, split):
+    '''Execute `suffix' spread across threads according to `split'
+
+    Returns the list of :class:`Operation` in the recorded history
+    '''
+    threads = max(split) + 1
+    ops = [
+        Operation(t, p, tuple(prefix._unwrap_args(p.bindings.values())))
+        for t, p in zip(split, suffix)]
+    events = itertools.count()
+    barrier = threading.Barrier(threads)
+
+    def _worker(t):
+        barrier.wait()
+        for op in ops:
+            if op.thread != t:
+                continue
+
+            # next() on itertools.count is atomic under the GIL
+            op.call = next(events)
+            try:
+                op.result = op.partial.command.fdo(*op.args)
+            except Exception as e:
+                op.result = e
+            op.ret = next(events)
+
+    workers = [threading.Thread(target=_worker, args=(t,)) for t in range(threads)]
+
+    # switch threads as often as possible to provoke interleavings
+    with _SWITCH_INTERVAL_LOCK:
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for w in workers:
+                w.start()
+            for w in workers:
+                w.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+    return ops
+
+def _step(model, op, state):
+    '''Try linearize `op' in `state', returning the new state or _REJECTED
+    '''
+    cmd = op.partial.command
+    model.state = copy.deepcopy(state)
+    try:
+        if cmd.fpre(model, op.args) is False:
+            return _REJECTED
+        if cmd.fpost(model, op.args, op.result) is False:
+            return _REJECTED
+        return cmd.fnext(model, op.args, op.result)
+    except AssertionError:
+        return _REJECTED
+
+def is_linearizable(model, ops, state):
+    '''Search for a sequential ordering of `ops' consistent with their real-time order
+    that the model accepts, starting from `state'
+
+    An operation may be linearized next if it was called before every remaining
+    operation returned.  Failed (done, state) pairs are memoised so that
+    interchangeable orderings reaching the same model state are explored once.
+    Unhashable states are compared by equality with copies of those that failed.
+    '''
+    failed = set()
+    failed_unhashable = collections.defaultdict(list)
+
+    def _failed(done, state):
+        try:
+            return (done, state) in failed
+        except TypeError:
+            return any(s == state for s in failed_unhashable[done])
+
+    def _fail(done, state):
+        try:
+            failed.add((done, state))
+        except TypeError:
+            failed_unhashable[done].append(copy.deepcopy(state))
+
+    def _search(done, state):
+        if len(done) == len(ops):
+            return True
+
+        if _failed(done, state):
+            return False
+
+        remaining = [i for i in range(len(ops)) if i not in done]
+        first_ret = min(ops[i].ret for i in remaining)
+        for i in remaining:
+            if ops[i].call > first_ret:
+                continue
+
+            new_state = _step(model, ops[i], state)
+            if new_state is not _REJECTED and _search(done | {i}, new_state):
+                return True
+
+        _fail(done, state)
+        return False
+
+    with asserts.change_assertions_log(None):
+        return _search(frozenset(), state)
+
+def check_linearizable(partials, threads=2, repeat=1, max_splits=None):
+    '''Run the :class:`model.Partials` `partials' concurrently and check linearizability
+
+    Commands up to and including the last named result are run sequentially, the
+    remaining commands are then split across `threads' threads in every way
+    (deterministically enumerated, up to `max_splits'), each split run `repeat' times.
+
+    Only sequences that are valid when run sequentially are checked.
+
+    Returns a :class:`LinearizabilityResult` for the first non-linearizable history
+    found, or None if the sequence does not meet its preconditions.
+    '''
+    if not partials.is_valid():
+        return None
+
+    n = _prefix_length(partials)
+    suffix = partials[n:]
+    if not suffix:
+        return LinearizabilityResult(True)
+
+    for split in itertools.islice(splits(len(suffix), threads), max_splits):
+        for _ in range(repeat):
+            prefix = _run_prefix(partials, n)
+            if prefix is None:
+                return None
+
+            ops = _execute(prefix, suffix, split)
+            log.debug('history: {}'.format(ops))
+            if not is_linearizable(prefix.model, ops, prefix.model.state):
+                return LinearizabilityResult(False, split, ops)
+
+    return LinearizabilityResult(True)
+
+def assert_linearizable(partials, threads=2, repeat=1, max_splits=None):
+    '''As :func:`check_linearizable` but raises :class:`NotLinearizable` on failure
+    and returns False for an invalid prefix, like :meth:`model.Partials.is_valid`
+    '''
+    result = check_linearizable(partials, threads=threads, repeat=repeat, max_splits=max_splits)
+    if result is None:
+        return False
+
+    if not result.linearizable:
+        raise NotLinearizable('linearizable', 'no sequential explanation for history\n> {}'.format(result.pretty))
+
+    return True
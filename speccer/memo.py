@@ -0,0 +1,74 @@
+# memo.py - Memoising pure property functions
+import functools
+import collections
+
+from . import dedup
+from . import runtime
+
+__all__ = [
+    'pure',
+]
+
+class Memo:
+    '''A table of results, bounded to `maxsize` entries
+    dropping the least recently used when full
+
+    Lookups are counted in Memo.hits and Memo.misses
+    and in the statistics of the current :class:`runtime.Runtime`
+    '''
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._table = collections.OrderedDict()
+
+    def lookup(self, key):
+        '''Returns (True, result) if there is a result stored for `key`
+        otherwise (False, None)
+        '''
+        rt = runtime.CURRENT
+        try:
+            r = self._table[key]
+        except KeyError:
+            self.misses += 1
+            rt.memo_misses += 1
+            return False, None
+
+        self._table.move_to_end(key)
+        self.hits += 1
+        rt.memo_hits += 1
+        return True, r
+
+    def store(self, key, result):
+        self._table[key] = result
+        if len(self._table) > self.maxsize:
+            self._table.popitem(last=False)
+
+def pure(f=None, maxsize=2**16):
+    '''Mark `f` as a pure function, so its results can be memoised
+
+    Calls to `f` are looked up by the fingerprints (see :func:`dedup.fingerprint`) of their arguments,
+    and when `f` is the function of a quantified Property the whole outcome of running it on
+    some value (including any nested Property it returns) is memoised too.
+
+    >>> @pure
+    ... def p(x, y):
+    ...     return x + y == y + x
+    >>> spec(3, forall(int, lambda x: forall(int, lambda y: p(x, y))))
+    '''
+    if f is None:
+        return functools.partial(pure, maxsize=maxsize)
+
+    memo = Memo(maxsize)
+
+    @functools.wraps(f)
+    def wrapper(*args, **kwargs):
+        key = ('call', dedup.fingerprint(args), dedup.fingerprint(kwargs))
+        found, r = memo.lookup(key)
+        if not found:
+            r = f(*args, **kwargs)
+            memo.store(key, r)
+        return r
+
+    wrapper.__memo__ = memo
+    return wrapper
@@ -1,19 +1,37 @@
 import os
-import inspect
+import sys
+import functools
 import collections
 
-def get_stack_path(i=0, depth=None):
-    '''Inspect Stack to get a relative name for this code point
+class StackPath:
+    '''The call stack `i` frames above the caller, up to `depth` frames of it
+
+    Only the code objects are kept, which is cheap and does not keep any frame's locals alive,
+    the name (see :func:`get_stack_path`) is made when first asked for with str()
     '''
-    stk = inspect.stack()[(2 + i):depth]
-    loc = []
+    __slots__ = ('_codes', '_name')
+
+    def __init__(self, i=0, depth=None):
+        codes = []
+        f = sys._getframe(1 + i)
+        while f is not None and (depth is None or len(codes) < depth):
+            codes.append(f.f_code)
+            f = f.f_back
 
-    for sf in reversed(stk):
-        _, fn = os.path.split(sf.filename)
-        f = sf.function
-        loc.append('[{}]{}'.format(fn, f))
+        self._codes = codes
+        self._name = None
 
-    return ':'.join(loc)
+    def __str__(self):
+        if self._name is None:
+            self._name = ':'.join(
+                '[{}]{}'.format(os.path.basename(c.co_filename), c.co_name)
+                for c in reversed(self._codes))
+        return self._name
+
+def get_stack_path(i=0, depth=None):
+    '''A relative name for this code point, made of the file and function of each frame on the stack
+    '''
+    return str(StackPath(i + 2, None if depth is None else max(0, depth - 2 - i)))
 
 
 def intersperse(its):
@@ -32,3 +50,15 @@ def intersperse(its):
             rets[idx] = e.value
 
     return tuple(rets)
+
+@functools.lru_cache(1024)
+def binomial(n, k):
+    '''The number of ways to choose k of n things
+    '''
+    if k < 0 or k > n:
+        return 0
+
+    r = 1
+    for i in range(min(k, n - k)):
+        r = r * (n - i) // (i + 1)
+    return r
@@ -2,15 +2,20 @@
 # author: Ben Simner
 
 import abc
+import copy
+import string
 import logging
 import inspect
+import itertools
 import collections
 from typing import List
 from pprint import pprint
 
 from . import asserts
-from .strategy import Strategy
-from .ops import values, value_args, mapS
+from . import typeable
+from . import linearizable
+from .strategy import Strategy, generate_args_from_strategies
+from .ops import values, mapS
 from ._errors import MissingStrategyError, InvalidPartials
 
 __all__ = [
@@ -38,6 +43,9 @@ class Partials:
         self.environment = None
         self.values = None
 
+        # (index, stage) of the partial that stopped the last validation, if any
+        self.failed_at = None
+
     def validate_pre(self):
         return self.is_valid(only_check_pre=True)
 
@@ -45,6 +53,16 @@ class Partials:
         with asserts.change_assertions_log(None):
             return self._validate_partials(only_check_pre=only_check_pre)
 
+    def is_linearizable(self, threads=2, repeat=1, max_splits=None):
+        '''Run the commands after the last named result concurrently across `threads'
+        threads and check the history against the sequential model
+
+        Returns True if it is linearizable, or False if the commands are not valid
+        when run sequentially, and raises :class:`linearizable.NotLinearizable` if
+        it is not linearizable, see :func:`linearizable.assert_linearizable`
+        '''
+        return linearizable.assert_linearizable(self, threads=threads, repeat=repeat, max_splits=max_splits)
+
     def _unwrap_args(self, args):
         for a in args:
             if isinstance(a, NameArg):
@@ -59,8 +77,9 @@ class Partials:
         self.model.reset_state()
         self.values = []
         self.environment = {}
+        self.failed_at = None
 
-        for partial in self._partials:
+        for i, partial in enumerate(self._partials):
             cmd = partial.command
             args = tuple(self._unwrap_args(partial.bindings.values()))
             log.debug('is_valid({} : {})'.format(cmd, args))
@@ -69,16 +88,19 @@ class Partials:
                 # precondition can just be `pass` which is not a failure case
                 if cmd.fpre(self.model, args) is False:
                     log.debug('*** FAIL: Pre-condition False')
+                    self.failed_at = (i, 'pre')
                     return False
             except AssertionError as e:
                 log.debug('*** FAIL: Pre-condition AssertionError')
                 log.debug('*** {}'.format(e))
+                self.failed_at = (i, 'pre')
                 name = '{}_pre'.format(cmd.name)
                 raise InvalidPartials(name, e) from e
 
             try:
                 v = cmd.fdo(*args)  # maybe add `self.model' ?
             except AssertionError as e:
+                self.failed_at = (i, 'execute')
                 name = '{}_execute'.format(cmd.name)
                 raise InvalidPartials(name, e) from e
 
@@ -92,8 +114,10 @@ class Partials:
                     # as with pre-condition can just `pass`
                     if cmd.fpost(self.model, args, v) is False:
                         log.debug('*** FAIL: Post-condition False')
+                        self.failed_at = (i, 'post')
                         return False
                 except AssertionError as e:
+                    self.failed_at = (i, 'post')
                     name = '{}_postcondition'.format(cmd.name)
                     raise InvalidPartials(name, e) from e
 
@@ -135,17 +159,87 @@ class Partials:
 
 log = logging.getLogger('model')
 
-VAR_LENGTH = 0
-VAR_NAMES = list(values(VAR_LENGTH, str))
+def _var_names():
+    '''All variable names, shortest first
+    a, b, ..., z, aa, ab, ..., zz, aaa, ...
+    '''
+    for n in itertools.count(1):
+        for cs in itertools.product(string.ascii_lowercase, repeat=n):
+            yield ''.join(cs)
+
+_VAR_GEN = _var_names()
+
+# all 1- and 2-letter names, enough for any reasonable sequence
+# GET_VAR grows the table (doubling) past that
+VAR_NAMES = list(itertools.islice(_VAR_GEN, 26 + 26**2))
 
 def GET_VAR(i):
-    global VAR_LENGTH, VAR_NAMES
     while i >= len(VAR_NAMES):
-        VAR_LENGTH += 1
-        VAR_NAMES = list(values(VAR_LENGTH, str))
+        VAR_NAMES.extend(itertools.islice(_VAR_GEN, len(VAR_NAMES)))
 
     return VAR_NAMES[i]
 
+def _name_partials(partials):
+    '''Given a list of partials where arguments may be a `ModelMeta.replacement_t'
+    referencing the result of an earlier partial, name those earlier partials
+    and replace the arguments with a :class:`NameArg`
+
+    Returns a new list, the original partials are not modified.
+    '''
+    var_c = 0
+    partials = partials[:]
+
+    for i, p in enumerate(partials):
+        for j, (name, a) in enumerate(p.bindings.items()):
+            # this arg should reference earlier partial
+            # so replace arg and partial
+            if isinstance(a.value, ModelMeta.replacement_t):
+                n = a.value.n
+                p_replacement = partials[n]
+
+                # give it a name if it has none
+                if not isinstance(p_replacement, NamedPartial):
+                    var = GET_VAR(var_c)
+                    partials[n] = NamedPartial.from_partial(p_replacement, var)
+                    var_c += 1
+                else:
+                    var = p_replacement.name
+
+                # replace the arg
+                partials[i] = partials[i].copy()
+                partials[i].bindings[name] = NameArg(var)
+
+    return partials
+
+class Producers:
+    '''A table of which earlier partials produce values of which type
+
+    Persistent: :meth:`add` returns a new table, so tables can be shared between
+    the branches of the partial generation.
+    '''
+    def __init__(self, entries=()):
+        # tuple of (return type, index of partial)
+        self._entries = entries
+
+    def add(self, t, n):
+        '''Record that partial `n` returns a `t`
+        '''
+        if t is None:
+            return self
+        return Producers(self._entries + ((t, n),))
+
+    def of(self, t):
+        '''All the earlier partials whose result can be used as a `t`
+        this includes those which return a subtype of `t`
+        '''
+        return [
+            ModelMeta.replacement_t(n)
+            for r, n in self._entries
+            if typeable.is_subtype(r, t)]
+
+    def __len__(self):
+        return len(self._entries)
+
 class Command:
     '''An @property like :class:`Command`
     It acts like @property except instead of getter and setter
@@ -157,12 +251,18 @@ class Command:
     command, pre-condition, post-condition and state-transition-function respectively.
     '''
 
-    def __init__(self, fdo, fpre=empty, fpost=empty, fnext=empty_state, fname=None):
+    def __init__(self, fdo, fpre=empty, fpost=empty, fnext=empty_state, fname=None, signature=None):
         self._fdo = fdo
         self._fpre = fpre
         self._fpost = fpost
         self._fnext = fnext
 
+        # signature of `fdo`, computed once on first use
+        # pre/post/next share `fdo` and so pass it along to the new Command
+        self._signature = signature
+        self._param_types = None
+        self._return_annotation = None
+
         try:
             self.name = fname or fdo.__qualname__
         except AttributeError:
@@ -199,37 +299,44 @@ class Command:
     def pre(self, f):
         '''Precondition for this :class:`Command`
         '''
-        return Command(self.fdo, f, self.fpost, self.fnext, self.name)
+        return Command(self.fdo, f, self.fpost, self.fnext, self.name, self._signature)
 
     def post(self, f):
-        return Command(self.fdo, self.fpre, f, self.fnext, self.name)
+        return Command(self.fdo, self.fpre, f, self.fnext, self.name, self._signature)
 
     def next(self, f):
-        return Command(self.fdo, self.fpre, self.fpost, f, self.name)
+        return Command(self.fdo, self.fpre, self.fpost, f, self.name, self._signature)
 
     # these are helper functions to the type signature of the `fdo` function
 
     @property
     def signature(self):
-        s = inspect.signature(self.fdo)
-        return s
+        if self._signature is None:
+            self._signature = inspect.signature(self.fdo)
+        return self._signature
 
     @property
     def return_annotation(self):
-        r = self.signature.return_annotation
-        if r is not inspect._empty:
-            return r
-        return None
+        if self._param_types is None:
+            self._resolve_types()
+        return self._return_annotation
 
     @property
     def parameters(self):
-        s = self.signature
-        return s.parameters
+        return self.signature.parameters
 
     @property
     def param_types(self):
-        for p in self.parameters.values():
-            yield p.annotation
+        if self._param_types is None:
+            self._resolve_types()
+        return self._param_types
+
+    def _resolve_types(self):
+        s = self.signature
+        self._param_types = tuple(p.annotation for p in s.parameters.values())
+
+        r = s.return_annotation
+        self._return_annotation = r if r is not inspect._empty else None
 
     def __call__(self, *args, **kwargs):
         '''
@@ -365,18 +472,28 @@ class ModelMeta(type):
     replacement_t = collections.namedtuple('replacement_t', ['n'])
 
     def __new__(mcls, name, bases, namespace):
+        cls = super().__new__(mcls, name, bases, namespace)
+
+        # the Command's of this model and those it inherits, by name
+        commands = collections.OrderedDict()
+        for klass in reversed(cls.__mro__):
+            for attr_name, value in vars(klass).items():
+                if isinstance(value, Command):
+                    commands[attr_name] = value
+
         cmdlist = list()
+        for attr_name, value in commands.items():
+            if attr_name not in namespace:
+                # inherited, so copied to take this model's _pre, _post and _next methods
+                value = copy.copy(value)
 
-        for name, value in namespace.items():
-            if isinstance(value, Command):
-                # look for _pre, _post and _next methods
-                value.fpre = namespace.get(name + '_pre', None)
-                value.fpost = namespace.get(name + '_post', None)
-                value.fnext = namespace.get(name + '_next', None)
-                cmdlist.append(value)
+            # look for _pre, _post and _next methods
+            value.fpre = getattr(cls, attr_name + '_pre', None)
+            value.fpost = getattr(cls, attr_name + '_post', None)
+            value.fnext = getattr(cls, attr_name + '_next', None)
+            cmdlist.append(value)
 
         cmdlist = sorted(cmdlist, key=lambda c: c.name)
-        cls = super().__new__(mcls, name, bases, namespace)
         cls.__modelcommands__ = tuple(cmdlist)
 
         cls.Command = type('{}_Command'.format(cls), (), {})
@@ -392,8 +509,15 @@ class ModelMeta(type):
             '''
             return ps.validate_pre()
 
+        def is_linearizable(ps: cls.Commands) -> bool:
+            '''Given a list of partials 'ps' return True if every concurrent
+            execution of them is linearizable, raising NotLinearizable if not
+            '''
+            return ps.is_linearizable()
+
         cls.is_valid = is_valid
         cls.validate_pre = validate_pre
+        cls.is_linearizable = is_linearizable
 
         class _CmdStrat(Strategy[cls.Command]):
             '''A Strategy for generating all permutations of valid commands in a model
@@ -403,9 +527,7 @@ class ModelMeta(type):
                     log.debug('YIELD_4')
                     yield k
 
-        def _generate_partials_from_cmds(depth, remaining_cmds, built_partials, replacements=None):
-            replacements = replacements or collections.defaultdict(list)
-
+        def _generate_partials_from_cmds(depth, remaining_cmds, built_partials, producers=Producers()):
             # finished all cmds
             if len(remaining_cmds) == 0:
                 log.debug('YIELD_3')
@@ -413,69 +535,34 @@ class ModelMeta(type):
                 return
 
             cmd, *cmds = remaining_cmds
-            types = list(cmd.param_types)
-            args = collections.deque(value_args(depth, *types))
-            first_pass = True
-
-            while args:
-                arg_tuple = args.popleft()
-                for i, (t, v) in enumerate(zip(types, arg_tuple)):
-                    if first_pass:
-                        for r in replacements[t]:
-                            replacement = arg_tuple[:i] + (r,) + arg_tuple[1 + i:]
-                            args.append(replacement)
-                        first_pass = False
-
-                    # catch a missing strategy and do something with it
-                    # namely stop trying to generate these partials and try add a replacement there instead
-                    if v is MissingStrategyError:
-                        break
-                else:
-                    partial_args = collections.OrderedDict()  # TODO: Wrap this in a BoundArguments
-                    for key, value in zip(cmd.parameters, arg_tuple):
-                        partial_args[key] = ValueArg(value)
-                    partial = Partial(cmd, partial_args)
-
-                    # copy defaultdict to depth 2
-                    new_replacements = collections.defaultdict(list)
-                    for key, value in replacements.items():
-                        new_replacements[key] = list(value)
-
-                    new_replacements[cmd.return_annotation].append(ModelMeta.replacement_t(len(built_partials)))
-                    # TODO: Replace (built_partials + [partial]) with something more efficient?
-                    # TODO: Restructure this so it's fairer ?
-                    log.debug('YIELD_2')
-                    yield from _generate_partials_from_cmds(depth, cmds, built_partials + [partial], new_replacements)
+
+            # each argument can either be a fresh value or the result of an earlier partial
+            # earlier results come first, then all arguments are enumerated fairly together
+            sources = [
+                itertools.chain(producers.of(t), values(depth, t))
+                for t in cmd.param_types]
+
+            for arg_tuple in generate_args_from_strategies(*sources):
+                # catch a missing strategy, there's no value (or earlier result) for that argument
+                if any(v is MissingStrategyError for v in arg_tuple):
+                    continue
+
+                partial_args = collections.OrderedDict()  # TODO: Wrap this in a BoundArguments
+                for key, value in zip(cmd.parameters, arg_tuple):
+                    partial_args[key] = ValueArg(value)
+                partial = Partial(cmd, partial_args)
+
+                new_producers = producers.add(cmd.return_annotation, len(built_partials))
+                # TODO: Replace (built_partials + [partial]) with something more efficient?
+                log.debug('YIELD_2')
+                yield from _generate_partials_from_cmds(depth, cmds, built_partials + [partial], new_producers)
 
         @mapS(Strategy[List[cls.Command]], register_type=cls.Commands)
         def _PartialStrat(depth, cmds):
             log.debug('_PartialStrat')
 
             for partials in _generate_partials_from_cmds(depth, cmds, []):
-                var_c = 0
-                partials = partials[:]
-
-                for i, p in enumerate(partials):
-                    for j, (name, a) in enumerate(p.bindings.items()):
-                        # this arg should reference earlier partial
-                        # so replace arg and partial
-                        if isinstance(a.value, ModelMeta.replacement_t):
-                            n = a.value.n
-                            p_replacement = partials[n]
-
-                            # give it a name if it has none
-                            if not isinstance(p_replacement, NamedPartial):
-                                var = GET_VAR(var_c)
-                                partials[n] = NamedPartial.from_partial(p_replacement, var)
-                                var_c += 1
-                            else:
-                                var = p_replacement.name
-
-                            # replace the arg
-                            partials[i] = partials[i].copy()
-                            partials[i].bindings[name] = NameArg(var)
-
-                yield cls.Commands(cls(), partials)
+                yield cls.Commands(cls(), _name_partials(partials))
 
         cls.__partial_strat__ = _PartialStrat
         return cls
@@ -16,6 +16,8 @@ log = logging.getLogger('ops')
 __all__ = [
     'value_args',
     'values',
+    'count',
+    'nth',
     'mapS',
     'implies',
     'assume',
@@ -40,23 +42,48 @@ def implies(f, t: type):
     t_new = type(t_name, (typ.typ,), {})
     t_new._failed_implications = 0
 
-    @mapS(strategy.Strategy[typ.typ], register_type=t_new)
-    def newStrat(d, v, *args):
+    def holds(v):
         try:
-            if f(v) is False:
-                raise AssertionError('{}[{}] failed'.format(impl_name, t_pretty))
+            return f(v) is not False
         except AssertionError:
-            t_new._failed_implications += 1
-        else:
+            return False
+
+    @mapS(strategy.Strategy[typ.typ], register_type=t_new)
+    def newStrat(d, v, *args):
+        if holds(v):
             yield v
+        else:
+            t_new._failed_implications += 1
 
     newStrat.__name__ = t_name
     newStrat.__qualname__ = t_name
+    # values of t that are also values of t_new, for shrinking.candidates
+    newStrat.__implies__ = (holds, typ.typ)
     return t_new
 
 def values(depth, t, **kwargs):
     yield from strategy.Strategy.get_strat_instance(t)(depth, **kwargs)
 
+def count(depth, t):
+    '''The number of values `values(depth, t)` yields
+    or None if the strategy for `t` cannot count them without generating them all
+    '''
+    s = strategy.Strategy.get_strat_instance(t)
+    if depth <= 0:
+        return 0
+
+    return s(depth).count(depth)
+
+def nth(depth, t, k):
+    '''The k-th value `values(depth, t)` yields, without generating the first k where possible
+    raising IndexError if there is no such value
+    '''
+    s = strategy.Strategy.get_strat_instance(t)
+    if depth <= 0 or k < 0:
+        raise IndexError(k)
+
+    return s(depth).nth(depth, k)
+
 def value_args(depth, *types, **kwargs):
     '''Creates a `Strategy' which generates all tuples of type *types
     i.e.
@@ -129,6 +156,13 @@ def mapS(strat, register_type=None, autoregister=False, **kwargs):
                     with contextlib.suppress(StopIteration):
                         yield _yield_one()
 
+            # f may yield any number of values for each of strat's
+            # so they cannot be counted or indexed as strat's are
+            def count(self, depth, *args):
+                return None
+
+            nth = strategy.Strategy.nth
+
         if register_type:
             strategy.register(register_type, MapStrat)
 
@@ -0,0 +1,338 @@
+# parallel.py - Distributing work over a process pool
+import attr
+
+import io
+import os
+import time
+import pickle
+import logging
+import traceback
+import collections
+import concurrent.futures
+
+from . import model
+from . import clauses
+from . import reporting
+from . import spec as specM
+from .strategy import Strategy
+from ._errors import InvalidPartials
+
+log = logging.getLogger('parallel')
+
+__all__ = [
+    'validate_model',
+    'run_property_set',
+]
+
+@attr.s
+class ModelFailure:
+    '''The first (in generation order) command sequence that failed validation
+    '''
+    index = attr.ib()
+    partials = attr.ib()
+    message = attr.ib()
+
+@attr.s
+class ModelRunResult:
+    '''Summary of a :func:`validate_model` run
+    '''
+    passed = attr.ib(default=0)
+    skipped = attr.ib(default=0)
+    failed = attr.ib(default=0)
+    first_failure = attr.ib(default=None)
+
+    @property
+    def ok(self):
+        return self.failed == 0
+
+def _encode_partials(partials):
+    '''Converts a :class:`model.Partials` into a picklable tuple
+
+    Commands are referred to by name and arguments as (name, is_var, value) triples
+    so that the sequence can be rebuilt against the model class in another process.
+    '''
+    enc = []
+    for p in partials:
+        name = p.name if isinstance(p, model.NamedPartial) else None
+        args = tuple(
+            (k, isinstance(a, model.NameArg), a.value)
+            for k, a in p.bindings.items())
+        enc.append((name, p.command.name, args))
+    return tuple(enc)
+
+def _decode_partials(model_cls, enc):
+    '''Inverse of :func:`_encode_partials`
+    '''
+    cmds = {c.name: c for c in model_cls.__modelcommands__}
+    partials = []
+    for name, cmd_name, args in enc:
+        bindings = collections.OrderedDict()
+        for k, is_var, v in args:
+            bindings[k] = model.NameArg(v) if is_var else model.ValueArg(v)
+
+        cmd = cmds[cmd_name]
+        if name is None:
+            partials.append(model.Partial(cmd, bindings))
+        else:
+            partials.append(model.NamedPartial(name, cmd, bindings))
+    return model_cls.Commands(model_cls(), partials)
+
+def _validate_one(model_cls, enc):
+    '''Validate a single encoded sequence
+
+    Returns (status, message, n) where status is one of 'pass', 'skip' or 'fail'
+    and `n' is the length of the prefix responsible for a skip/fail
+
+    An exception raised by the system under test fails the sequence, rather than the run
+    '''
+    ps = _decode_partials(model_cls, enc)
+    try:
+        if ps.is_valid():
+            return 'pass', None, len(enc)
+    except InvalidPartials as e:
+        i, _ = ps.failed_at
+        return 'fail', str(e), i + 1
+    except Exception as e:
+        # raised by the command after the last value, or by the post-condition or next state of that one
+        msg = 'raised {}'.format(traceback.format_exception_only(type(e), e)[-1].strip())
+        return 'fail', msg, min(len(ps.values) + 1, len(enc))
+
+    i, stage = ps.failed_at
+    if stage == 'pre':
+        # did not meet precondition, like an implication this is not a failure
+        return 'skip', None, i + 1
+
+    return 'fail', 'post-condition of {} returned False'.format(ps[i].command.name), i + 1
+
+def _validate_batch(model_cls, batch):
+    '''Validate a batch of (index, encoded) sequences that share some prefix
+
+    Sequences are deterministic, so once some prefix is known to be skipped or failed
+    every later sequence in the batch extending it is decided without re-executing it.
+    Only those prefixes are shared: the state of the system under test after a passing prefix
+    cannot be kept, so every other sequence is executed from the start.
+
+    Returns (index, status, message, encoded) for each sequence, encoded only for failures
+    '''
+    decided = {}
+    results = []
+    for idx, enc in batch:
+        for n in range(1, len(enc) + 1):
+            if enc[:n] in decided:
+                status, msg = decided[enc[:n]]
+                break
+        else:
+            status, msg, n = _validate_one(model_cls, enc)
+            if status != 'pass':
+                decided[enc[:n]] = (status, msg)
+
+        results.append((idx, status, msg, enc if status == 'fail' else None))
+    return results
+
+def _batch_by_prefix(encs, batch_size, prefix):
+    '''Group consecutive (index, encoded) pairs with the same first `prefix' commands
+    into batches of at most `batch_size', taking them from `encs' as they are needed
+    '''
+    batch = []
+    for idx, enc in encs:
+        if batch and (len(batch) == batch_size or batch[0][1][:prefix] != enc[:prefix]):
+            yield batch
+            batch = []
+        batch.append((idx, enc))
+
+    if batch:
+        yield batch
+
+def _map_bounded(ex, f, model_cls, batches, limit):
+    '''The results of f(model_cls, batch) for each of `batches', in the order they finish,
+    with at most `limit' submitted to the executor `ex' at once
+
+    As Executor.map would take (and so generate) every batch before running any
+    '''
+    pending = set()
+    for batch in batches:
+        if len(pending) >= limit:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for fut in done:
+                yield fut.result()
+        pending.add(ex.submit(f, model_cls, batch))
+
+    for fut in concurrent.futures.as_completed(pending):
+        yield fut.result()
+
+def validate_model(model_cls, depth, processes=None, batch_size=32, prefix=2):
+    '''Validate all command sequences of `model_cls' up to depth `depth'
+
+    Each generated sequence is independent (it owns its own `model_cls()` instance)
+    so sequences are batched by their first `prefix' commands and validated across
+    a pool of `processes' worker processes (processes=0 validates in this process).
+
+    Sequences whose precondition fails are skipped, as with an implication.
+    The reported failure is always the first failing sequence in generation order,
+    regardless of which worker finished first.
+
+    Sequences are generated as batches are dispatched, so only a few batches per worker
+    are held at once rather than the whole search space.
+
+    >>> result = validate_model(MyModel, 5)
+    >>> result.ok
+    False
+    >>> print(result.first_failure.partials.pretty)
+    '''
+    encs = (
+        (i, _encode_partials(ps))
+        for i, ps in enumerate(Strategy[model_cls.Commands](depth)))
+    batches = _batch_by_prefix(encs, batch_size, prefix)
+
+    result = ModelRunResult()
+    first = None
+
+    def _add(results):
+        nonlocal first
+        for idx, status, msg, enc in results:
+            if status == 'pass':
+                result.passed += 1
+            elif status == 'skip':
+                result.skipped += 1
+            else:
+                result.failed += 1
+                if first is None or idx < first[0]:
+                    first = (idx, msg, enc)
+
+    if processes == 0:
+        for b in batches:
+            _add(_validate_batch(model_cls, b))
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as ex:
+            limit = 2 * (processes or os.cpu_count() or 1)
+            for results in _map_bounded(ex, _validate_batch, model_cls, batches, limit):
+                _add(results)
+
+    log.debug('validate_model: {} sequences'.format(result.passed + result.skipped + result.failed))
+    if first is not None:
+        idx, msg, enc = first
+        result.first_failure = ModelFailure(idx, _decode_partials(model_cls, enc), msg)
+
+    return result
+
+@attr.s
+class PropertyResult:
+    '''The result of running one property of a :class:`pset.PropertySet`
+
+    - PropertyResult.result: 'pass', 'fail' or 'error'
+    - PropertyResult.outcome: the name of the :class:`clauses.Outcome` class, or None if the property could not be run
+    - PropertyResult.report, PropertyResult.events: the text output, and JSON Lines events (or None), of its run
+    - PropertyResult.value: the Outcome itself, only when run in this process
+    '''
+    name = attr.ib()
+    result = attr.ib()
+    outcome = attr.ib()
+    calls = attr.ib()
+    elapsed = attr.ib()
+    report = attr.ib(default='')
+    events = attr.ib(default=None)
+    value = attr.ib(default=None, repr=False)
+
+@attr.s
+class PropertySetResult:
+    '''Summary of a :func:`run_property_set` run, with one :class:`PropertyResult` per property in name order
+    '''
+    name = attr.ib()
+    results = attr.ib(default=attr.Factory(list))
+    elapsed = attr.ib(default=0.0)
+
+    @property
+    def passed(self):
+        return sum(r.result == 'pass' for r in self.results)
+
+    @property
+    def failed(self):
+        return sum(r.result == 'fail' for r in self.results)
+
+    @property
+    def errors(self):
+        return sum(r.result == 'error' for r in self.results)
+
+    @property
+    def ok(self):
+        return self.passed == len(self.results)
+
+def _run_member(pset_cls, name, depth, options, json, keep):
+    '''Run the property `name' of a new `pset_cls' to depth `depth'
+    capturing its text output and (if `json') its JSON Lines events
+
+    Returns a :class:`PropertyResult`, with the Outcome itself if `keep'
+    '''
+    out = io.StringIO()
+    events = io.StringIO() if json else None
+    options = attr.evolve(options, output_file=out, json_file=events, progress=None)
+
+    t0 = time.perf_counter()
+    try:
+        ps = pset_cls()
+        ps.depth = depth
+        prop = source = getattr(ps, name)
+        if isinstance(prop, clauses.Property):
+            source = None
+        else:
+            prop = prop(*options.args)
+            prop.name = name
+
+        outcome = specM._spec_prop(depth, prop, options, source=source)
+    except Exception:
+        return PropertyResult(
+            name, 'error', None, 0, time.perf_counter() - t0,
+            report=out.getvalue() + traceback.format_exc(),
+            events=events and events.getvalue())
+
+    return PropertyResult(
+        name, reporting.result_of(outcome), type(outcome).__name__,
+        outcome.state.get('calls', 0), time.perf_counter() - t0,
+        report=out.getvalue(), events=events and events.getvalue(),
+        value=outcome if keep else None)
+
+def run_property_set(depth, ps, options, processes=0):
+    '''Run every property of the :class:`pset.PropertySet` `ps' to depth `depth'
+
+    Properties are run independently, each on a new instance of type(ps), carrying on past any failures,
+    one after another in this process (processes=0) or across a pool of `processes' worker processes
+    (None for one per CPU). Their text output and JSON Lines events are captured and
+    returned in the results, for the caller to write out in order.
+    options.reporters are only sent events when run in this process.
+
+    To run across processes type(ps) must be picklable (defined at the top level of a module),
+    if it is not the properties are run in this process instead.
+
+    Returns a :class:`PropertySetResult`
+    '''
+    pset_cls = type(ps)
+    names = sorted(pset_cls.__properties__)
+    json = options.json_file is not None
+    t0 = time.perf_counter()
+
+    if processes != 0:
+        try:
+            pickle.dumps(pset_cls)
+        except (pickle.PicklingError, AttributeError, TypeError) as e:
+            log.warning('cannot run {} across processes, running in this process: {}'.format(pset_cls.__qualname__, e))
+            processes = 0
+
+    if processes == 0:
+        results = [_run_member(pset_cls, name, depth, options, json, True) for name in names]
+    else:
+        # files and reporters stay in this process
+        worker_options = attr.evolve(options, output_file=None, json_file=None, reporters=[])
+        with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as ex:
+            futures = [
+                ex.submit(_run_member, pset_cls, name, depth, worker_options, json, False)
+                for name in names]
+
+            results = []
+            for name, f in zip(names, futures):
+                try:
+                    results.append(f.result())
+                except Exception:
+                    results.append(PropertyResult(name, 'error', None, 0, 0.0, report=traceback.format_exc()))
+
+    return PropertySetResult(
+        getattr(ps, 'name', pset_cls.__name__), results, time.perf_counter() - t0)
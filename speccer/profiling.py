@@ -0,0 +1,147 @@
+# profiling.py - Profiling the run of a single property
+import attr
+
+import os
+import re
+import sys
+import pstats
+import cProfile
+import sysconfig
+import threading
+import collections
+
+__all__ = [
+    'Profile',
+]
+
+_SPECCER_DIR = os.path.dirname(os.path.abspath(__file__)) + os.sep
+_STDLIB_DIRS = tuple(
+    os.path.abspath(sysconfig.get_paths()[k]) + os.sep for k in ('stdlib', 'platstdlib'))
+
+def _category(filename):
+    '''Whether code in `filename` is part of speccer, the user's code or something else
+    (the standard library or a built-in)
+    '''
+    if filename == '~' or filename.startswith('<'):
+        return 'other'
+
+    path = os.path.abspath(filename)
+    if path.startswith(_SPECCER_DIR):
+        return 'speccer'
+    elif path.startswith(_STDLIB_DIRS) or 'site-packages' in path:
+        return 'other'
+    return 'user'
+
+def _filename(name, ext):
+    return '{}.{}'.format(re.sub(r'[^\w.-]+', '_', name).strip('_') or 'property', ext)
+
+@attr.s
+class Profile:
+    '''Where the time went while running a property, see :func:`profiler`
+
+    - Profile.mode: 'cprofile' or 'sample'
+    - Profile.path: the file the profile was written to
+    - Profile.speccer, Profile.user, Profile.other: time spent in speccer itself, in the user's
+        code (the property functions, strategies and models) and in the standard library and built-ins
+        in seconds for 'cprofile' and in samples for 'sample'
+    '''
+    mode = attr.ib()
+    path = attr.ib()
+    speccer = attr.ib(default=0)
+    user = attr.ib(default=0)
+    other = attr.ib(default=0)
+
+    @property
+    def total(self):
+        return self.speccer + self.user + self.other
+
+class CProfiler:
+    '''Profiles with cProfile, writing a pstats file to `path`
+
+    The time in each function (excluding the functions it calls) is attributed
+    to the category of the file it is defined in, except that time in the standard library and built-ins
+    is attributed to the categories of their direct callers where those are speccer or user code
+    '''
+    def __init__(self, path):
+        self.path = path
+        self._profile = cProfile.Profile()
+
+    def start(self):
+        self._profile.enable()
+
+    def stop(self):
+        self._profile.disable()
+        self._profile.dump_stats(self.path)
+
+        result = Profile('cprofile', self.path)
+        for (filename, _, _), (_, _, tottime, _, callers) in pstats.Stats(self._profile).stats.items():
+            c = _category(filename)
+            if c != 'other':
+                setattr(result, c, getattr(result, c) + tottime)
+                continue
+
+            # split between the callers by the time spent in this function on their behalf
+            for (caller_file, _, _), (_, _, caller_tottime, _) in callers.items():
+                c = _category(caller_file)
+                setattr(result, c, getattr(result, c) + caller_tottime)
+        return result
+
+class SamplingProfiler:
+    '''Samples the stack of the thread that started it every `interval` seconds from another thread,
+    writing the samples to `path` as collapsed stacks ("f;g;h count" lines, as read by flamegraph.pl)
+
+    Each sample is attributed to the category of the innermost frame in speccer or user code
+    '''
+    def __init__(self, path, interval=0.001):
+        self.path = path
+        self.interval = interval
+        self._stacks = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._target = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, name='speccer-profiler', daemon=True)
+        self._thread.start()
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_filename, code.co_name))
+                frame = frame.f_back
+
+            if stack:
+                self._stacks[tuple(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+        result = Profile('sample', self.path)
+        with open(self.path, 'w') as f:
+            for stack, count in self._stacks.most_common():
+                f.write('{} {}\n'.format(
+                    ';'.join('{}:{}'.format(os.path.basename(fn), name) for fn, name in stack), count))
+
+                for fn, _ in reversed(stack):
+                    c = _category(fn)
+                    if c != 'other':
+                        break
+                setattr(result, c, getattr(result, c) + count)
+        return result
+
+def profiler(mode, name, directory='.', interval=0.001):
+    '''A profiler for the run of the property called `name`
+    writing <name>.pstats (mode='cprofile') or <name>.folded (mode='sample') into `directory`
+
+    The profiler has start() and stop() methods, stop() returns a :class:`Profile`
+    '''
+    if mode == 'cprofile':
+        return CProfiler(os.path.join(directory, _filename(name, 'pstats')))
+    elif mode == 'sample':
+        return SamplingProfiler(os.path.join(directory, _filename(name, 'folded')), interval=interval)
+    raise ValueError('unknown profile mode {!r}, expected \'cprofile\' or \'sample\''.format(mode))
@@ -49,7 +49,7 @@ def unittest_wrapper(depth):
         for p in NewPSet.__properties__:
             def _f(self, p=p):
                 self.depth = depth
-                out = speccer.spec(depth, getattr(self, p), output=False)
+                out = speccer.spec(depth, getattr(self, p), outfile=None)
                 # raise other exceptions out
                 if isinstance(out, speccer.UnrelatedException):
                     raise out.reason
@@ -0,0 +1,178 @@
+# pytest_plugin.py - Collecting and running properties as pytest items
+'''A pytest plugin, registered as `speccer' when speccer is installed
+
+Collects module-level `prop_*' functions, and every property of each :class:`pset.PropertySet`
+subclass, from the test modules pytest collects, as one item per property.
+PropertySet's whose names start with an underscore are not collected.
+Items are ordinary pytest items so pytest-xdist distributes them like any other test.
+
+    $ pytest --speccer-depth 5
+    $ pytest --speccer-no-cache      # run every property, even unchanged ones
+    $ pytest --speccer-stats         # print the calls and cases/sec of each property
+
+A property that passed is skipped on later runs at the same depth as long as the code of its
+`prop_*' function (or PropertySet class) and the user code it refers to is unchanged,
+the same as ``spec(..., cache=True)`` see :mod:`speccer.cache`.
+Results are kept in pytest's cache directory.
+'''
+import pytest
+
+import io
+import inspect
+import unittest
+
+from . import pset
+from . import clauses
+from . import reporting
+from .spec import Options, spec as run_spec
+
+DEFAULT_DEPTH = 5
+
+def pytest_addoption(parser):
+    group = parser.getgroup('speccer')
+    group.addoption('--speccer-depth', type=int, default=None,
+                    help='depth to run properties to (default: the speccer_depth ini option, or {})'.format(DEFAULT_DEPTH))
+    group.addoption('--speccer-no-cache', action='store_true', default=False,
+                    help='run every property, even those unchanged since they last passed')
+    group.addoption('--speccer-stats', action='store_true', default=False,
+                    help='print the calls, time and cases/sec of each property')
+    parser.addini('speccer_depth', 'depth to run properties to', default=str(DEFAULT_DEPTH))
+
+def _depth(config):
+    depth = config.getoption('speccer_depth')
+    if depth is None:
+        depth = int(config.getini('speccer_depth'))
+    return depth
+
+def _is_pset(obj):
+    return (
+        isinstance(obj, type)
+        and issubclass(obj, pset.PropertySet)
+        and obj is not pset.PropertySet
+        # already collected as a TestCase, see pset.unittest_wrapper
+        and not issubclass(obj, unittest.TestCase))
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pycollect_makeitem(collector, name, obj):
+    if name.startswith('_'):
+        return None
+    elif _is_pset(obj):
+        return PropertySetCollector.from_parent(collector, name=name, obj=obj)
+    elif name.startswith('prop_') and inspect.isfunction(obj):
+        return PropertyItem.from_parent(collector, name=name, target=lambda: obj, source=obj)
+    return None
+
+class PropertyFailed(Exception):
+    '''A property did not pass, with the text report of its run
+    '''
+
+class PropertySetCollector(pytest.Collector):
+    '''Collects each property of a PropertySet class as a :class:`PropertyItem`
+    '''
+    def __init__(self, *, obj, **kwargs):
+        super().__init__(**kwargs)
+        self.obj = obj
+
+    def collect(self):
+        for name in sorted(self.obj.__properties__):
+            yield PropertyItem.from_parent(
+                self, name=name, target=self._target(name), source=self.obj)
+
+    def _target(self, name):
+        def target():
+            ps = self.obj()
+            ps.depth = _depth(self.config)
+            return getattr(ps, name)
+        return target
+
+    def reportinfo(self):
+        return self.path, _lineno(self.obj), self.name
+
+def _lineno(obj):
+    try:
+        return inspect.getsourcelines(obj)[1] - 1
+    except (OSError, TypeError):
+        return None
+
+class PropertyItem(pytest.Item):
+    '''Runs one property with :func:`spec.spec`
+
+    `target()` returns what to pass to spec (a Property, or a function returning one)
+    and `source` is the function or class it is defined by, for reporting
+    '''
+    def __init__(self, *, target, source, **kwargs):
+        super().__init__(**kwargs)
+        self.target = target
+        self.source = source
+
+    def _cache_dir(self):
+        '''The directory of the :class:`cache.ResultCache`, or None to not cache results
+        '''
+        cache = getattr(self.config, 'cache', None)
+        if cache is None or self.config.getoption('speccer_no_cache'):
+            return None
+        return str(cache.makedir('speccer'))
+
+    def runtest(self):
+        depth = _depth(self.config)
+        cache_dir = self._cache_dir()
+
+        out = io.StringIO()
+        options = Options(output_file=out, progress=None, instrument=True,
+                          cache=cache_dir is not None, cache_dir=cache_dir)
+        outcome = run_spec(depth, self.target(), options)
+        if isinstance(outcome, clauses.CachedSuccess):
+            pytest.skip('unchanged since it passed at depth {}'.format(depth))
+
+        stats = outcome.state.get('stats')
+        self.user_properties.append(('speccer', dict(
+            depth=depth,
+            result=reporting.result_of(outcome),
+            calls=outcome.state.get('calls', 0),
+            elapsed=stats.elapsed if stats else None,
+            cases_per_sec=stats.cases_per_sec if stats else None)))
+        self.add_report_section('call', 'speccer', out.getvalue())
+
+        if not isinstance(outcome, clauses.Success):
+            raise PropertyFailed(out.getvalue())
+
+    def repr_failure(self, excinfo):
+        if isinstance(excinfo.value, PropertyFailed):
+            return str(excinfo.value)
+        return super().repr_failure(excinfo)
+
+    def reportinfo(self):
+        if isinstance(self.source, type):
+            return self.path, _lineno(self.source), self.nodeid.split('::', 1)[-1]
+        return self.path, _lineno(self.source), self.name
+
+class StatsReporter:
+    '''Collects the speccer stats of each property from the test reports
+    (which also works when pytest-xdist runs them in other processes) to print in the summary
+    '''
+    def __init__(self):
+        self.stats = []
+
+    def pytest_runtest_logreport(self, report):
+        if report.when != 'call':
+            return
+
+        for name, value in report.user_properties:
+            if name == 'speccer':
+                self.stats.append((report.nodeid, value))
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.stats:
+            return
+
+        tr = terminalreporter
+        tr.section('speccer')
+        for nodeid, s in self.stats:
+            rate = s['cases_per_sec']
+            tr.write_line('{:<60} {:<5} depth {:<3} {:>10} call(s) {:>9.3f}s {}'.format(
+                nodeid, s['result'], s['depth'], s['calls'], s['elapsed'] or 0.0,
+                '{:.0f} cases/sec'.format(rate) if rate else ''))
+
+def pytest_configure(config):
+    if config.getoption('speccer_stats'):
+        config.pluginmanager.register(StatsReporter(), 'speccer-stats')
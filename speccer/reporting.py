@@ -0,0 +1,95 @@
+# reporting.py - Events of a spec run, and their consumers
+import attr
+
+import json
+
+from . import clauses
+
+__all__ = [
+    'Reporter',
+    'JSONLinesReporter',
+]
+
+class Reporter:
+    '''A consumer of the events of a :func:`spec.spec` run
+
+    Each method is one kind of event, by default they do nothing.
+    The text output of spec is one Reporter (see :class:`spec.TextReporter`)
+    '''
+    def start(self, prop, depth):
+        '''Property `prop` started running to depth `depth`
+        '''
+
+    def progress(self, prop, depth, calls, scale, elapsed):
+        '''Property `prop` has ran `calls` cases in `elapsed` seconds
+
+        Sent for every `scale` cases, where the scale grows by powers of 10 as the run goes on
+        '''
+
+    def finish(self, prop, depth, outcome, calls, scale, elapsed):
+        '''Property `prop` finished after `calls` cases and `elapsed` seconds with `outcome`
+        '''
+
+def _to_json(o):
+    if attr.has(type(o)):
+        return attr.asdict(o)
+    return repr(o)
+
+def _rate(calls, elapsed):
+    return calls / elapsed if elapsed > 0 else None
+
+def result_of(outcome):
+    ''''pass', 'fail' or 'error' for the :class:`clauses.Outcome` `outcome`
+    '''
+    if isinstance(outcome, clauses.UnrelatedException):
+        return 'error'
+    elif isinstance(outcome, clauses.Failure):
+        return 'fail'
+    return 'pass'
+
+class JSONLinesReporter(Reporter):
+    '''Writes each event as a line of JSON to `file`
+
+    e.g.
+        {"event": "start", "property": "prop_rev", "depth": 3}
+        {"event": "progress", "property": "prop_rev", "depth": 3, "calls": 1, ...}
+        {"event": "finish", "property": "prop_rev", "depth": 3, "result": "fail", "counterexample": {...}, ...}
+    '''
+    def __init__(self, file):
+        self.file = file
+
+    def _write(self, event, prop, depth, **data):
+        data = dict(event=event, property=prop.name, depth=depth, **data)
+        self.file.write(json.dumps(data, default=_to_json))
+        self.file.write('\n')
+        self.file.flush()
+
+    def start(self, prop, depth):
+        self._write('start', prop, depth)
+
+    def progress(self, prop, depth, calls, scale, elapsed):
+        self._write('progress', prop, depth,
+                    calls=calls, elapsed=elapsed, cases_per_sec=_rate(calls, elapsed))
+
+    def finish(self, prop, depth, outcome, calls, scale, elapsed):
+        data = dict(
+            result=result_of(outcome),
+            outcome=type(outcome).__name__,
+            calls=calls,
+            elapsed=elapsed,
+            cases_per_sec=_rate(calls, elapsed),
+            failed_implications=prop.failed_implications,
+            state={k: v for k, v in outcome.state.items() if k not in ('calls', 'depth')},
+        )
+
+        if isinstance(outcome, (clauses.Counter, clauses.Witness)):
+            key = 'counterexample' if isinstance(outcome, clauses.Failure) else 'witness'
+            data[key] = {arg: repr(v) for arg, v in outcome.reason.arguments.items()}
+            data['in_property'] = outcome.prop.name
+
+        if isinstance(outcome, clauses.AssertionCounter):
+            data['message'] = outcome.message
+        elif isinstance(outcome, clauses.UnrelatedException):
+            data['exception'] = repr(outcome.reason)
+
+        self._write('finish', prop, depth, **data)
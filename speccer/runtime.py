@@ -0,0 +1,59 @@
+# runtime.py - Settings for the property currently being run
+import attr
+
+import contextlib
+
+@attr.s
+class Runtime:
+    '''Settings that :func:`spec.spec` passes down to the running :class:`clauses.Property`
+
+    Settings:
+    - Runtime.compiled: bool
+        When True, quantified properties draw their values from compiled strategies
+        (see :mod:`speccer.compiled`) instead of `Strategy[t](depth)`
+
+    - Runtime.samples: int or None
+        When set, quantified properties test this many values drawn at random
+        (see :mod:`speccer.sampling`) instead of every value up to the depth
+
+    - Runtime.random: random.Random
+        The random number generator samples are drawn with
+
+    - Runtime.dedup: bool
+        When True, quantified properties skip values they have already been tested on
+        (see :mod:`speccer.dedup`) counting them in Runtime.duplicates
+
+    - Runtime.cost_order: bool
+        When True, `p & q` and `p | q` run whichever of p and q had the cheapest cases
+        in previous runs to completion first, instead of interspersing them
+
+    - Runtime.shrink: bool
+        When True, counterexamples to forall properties are shrunk
+        (see :mod:`speccer.shrinking`) re-running the property at most Runtime.shrink_budget times
+    '''
+    compiled = attr.ib(default=False)
+    samples = attr.ib(default=None)
+    random = attr.ib(default=None)
+    shrink = attr.ib(default=False)
+    shrink_budget = attr.ib(default=100)
+    dedup = attr.ib(default=False)
+    cost_order = attr.ib(default=False)
+
+    # statistics for the run
+    # stats is an instrument.Stats, or None if the run is not instrumented
+    stats = attr.ib(default=None)
+    duplicates = attr.ib(default=0)
+    memo_hits = attr.ib(default=0)
+    memo_misses = attr.ib(default=0)
+
+CURRENT = Runtime()
+
+@contextlib.contextmanager
+def change_runtime(rt):
+    global CURRENT
+    old_rt = CURRENT
+    CURRENT = rt
+    try:
+        yield rt
+    finally:
+        CURRENT = old_rt
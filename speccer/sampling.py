@@ -0,0 +1,110 @@
+# sampling.py - Drawing values of a type uniformly at random
+import logging
+import itertools
+
+from . import ops
+from . import typeable
+from . import strategy
+from . import default_strategies as ds
+from .misc import binomial
+
+log = logging.getLogger('sampling')
+
+__all__ = [
+    'draw',
+    'sample',
+]
+
+# Each sampler draws a value of a type constructor applied to some argument types,
+# such that every one of the ops.count(depth, t) values is equally likely
+# without decoding a (possibly astronomically large) index with ops.nth
+
+def _list(depth, rng, t):
+    # counts[d] = ops.count(d, List[t])
+    counts = [0]
+    for d in range(1, depth + 1):
+        counts.append(1 + ops.count(d, t)*counts[-1])
+
+    # [] is one of counts[d] values, the rest are [x] + xs for uniform x and xs
+    xs = []
+    for d in range(depth, 0, -1):
+        if rng.randrange(counts[d]) == 0:
+            break
+
+        xs.append(draw(depth=d, t=t, rng=rng))
+    return xs
+
+def _set(depth, rng, t):
+    c = ops.count(depth, t)
+    k = rng.randrange(sum(binomial(c, n) for n in range(depth)))
+    n = 0
+    while k >= binomial(c, n):
+        k -= binomial(c, n)
+        n += 1
+
+    idxs = set()
+    while len(idxs) < n:
+        idxs.add(rng.randrange(c))
+    return {ops.nth(depth, t, i) for i in idxs}
+
+def _tuple(depth, rng, *ts):
+    return tuple(draw(depth, t, rng) for t in ts)
+
+def _union(depth, rng, *ts):
+    counts = [ops.count(depth, t) for t in ts]
+    k = rng.randrange(sum(counts))
+    for t, c in zip(ts, counts):
+        if k < c:
+            return draw(depth, t, rng)
+        k -= c
+
+SAMPLERS = {
+    ds.ListStrat: _list,
+    ds.SetStrat: _set,
+    ds.TupleStrat: _tuple,
+    ds.UnionStrat: _union,
+}
+
+def draw(depth, t, rng):
+    '''Draw one of the values of `Strategy[t](depth)` uniformly at random
+    using the :class:`random.Random` instance `rng`
+
+    If the strategy for `t` cannot count its values (see :func:`ops.count`)
+    they are all generated to draw one of them
+    '''
+    n = ops.count(depth, t)
+    if n is None:
+        log.debug('cannot draw {} without generating it, no count'.format(t))
+        vs = list(ops.values(depth, t))
+        if not vs:
+            raise IndexError('Cannot draw from an empty strategy')
+        return rng.choice(vs)
+
+    if not n:
+        raise IndexError('Cannot draw from an empty strategy')
+
+    # as in compiled._compile, not for strategies derived from a generated one
+    strat = strategy.get_strat_instance(t)
+    origin = vars(strat).get('__generated_from__')
+    if origin in SAMPLERS:
+        typ = typeable.from_type(t)
+        return SAMPLERS[origin](depth, rng, *(a.typ for a in typ.args))
+
+    return ops.nth(depth, t, rng.randrange(n))
+
+def sample(depth, t, n, rng):
+    '''Generate `n` values of `Strategy[t](depth)` drawn uniformly at random (with replacement)
+
+    If the strategy for `t` cannot count its values, falls back to the first `n` values it generates
+    '''
+    c = ops.count(depth, t)
+    if c is None:
+        log.debug('cannot sample {}, no count'.format(t))
+        yield from itertools.islice(ops.values(depth, t), n)
+        return
+
+    if c == 0:
+        return
+
+    for _ in range(n):
+        yield draw(depth, t, rng)
@@ -0,0 +1,224 @@
+# shrinking.py - Shrinking counterexamples to smaller ones
+import attr
+
+import logging
+
+from . import ops
+from . import _errors
+from . import typeable
+from . import strategy
+from . import default_strategies as ds
+
+log = logging.getLogger('shrinking')
+
+__all__ = [
+    'shrink',
+    'candidates',
+]
+
+@attr.s
+class Shrink:
+    '''The result of shrinking some counterexample
+
+    - Shrink.original: the counterexample that was shrunk
+    - Shrink.value: the smallest counterexample found
+    - Shrink.steps: each smaller counterexample found, in order, ending with Shrink.value
+    - Shrink.evaluations: the number of times the property was re-run
+    '''
+    original = attr.ib()
+    value = attr.ib()
+    steps = attr.ib(default=attr.Factory(list))
+    evaluations = attr.ib(default=0)
+
+# Each shrinker yields candidates smaller than some value, smallest first
+
+def _int(v):
+    if v == 0:
+        return
+
+    yield 0
+    if v < 0:
+        yield -v
+
+    h = v // 2 if v > 0 else -(-v // 2)
+    if h != 0:
+        yield h
+
+    s = v - 1 if v > 0 else v + 1
+    if s not in (0, h):
+        yield s
+
+def _nat(v):
+    if v == 0:
+        return
+
+    yield 0
+    if v // 2 != 0:
+        yield v // 2
+    if v - 1 not in (0, v // 2):
+        yield v - 1
+
+def _neg(v):
+    for x in _nat(-v):
+        yield -x
+
+def _str(v):
+    i = ds.LETTERS.index(v)
+    if i > 0:
+        yield ds.LETTERS[0]
+    if i > 1:
+        yield ds.LETTERS[i - 1]
+
+def _bool(v):
+    if v:
+        yield False
+
+def _list(depth, v, t):
+    if not v:
+        return
+
+    yield []
+
+    n = len(v)
+    if n > 1:
+        yield v[:n // 2]
+        yield v[n // 2:]
+
+    for i in range(n):
+        yield v[:i] + v[i + 1:]
+
+    for i, x in enumerate(v):
+        for c in candidates(depth, t, x):
+            yield v[:i] + [c] + v[i + 1:]
+
+def _set(depth, v, t):
+    if not v:
+        return
+
+    yield set()
+
+    for x in v:
+        yield v - {x}
+
+    for x in v:
+        for c in candidates(depth, t, x):
+            yield (v - {x}) | {c}
+
+def _tuple(depth, v, *ts):
+    for i, (t, x) in enumerate(zip(ts, v)):
+        for c in candidates(depth, t, x):
+            yield v[:i] + (c,) + v[i + 1:]
+
+def _union(depth, v, *ts):
+    # the smallest value of each alternative, up to the one v is already the smallest of
+    for t in ts:
+        try:
+            x = ops.nth(depth, t, 0)
+        except IndexError:
+            continue
+
+        if x == v:
+            break
+        yield x
+
+    # v is a value of one of the alternatives, but we do not know which
+    # so try shrink it as each of them
+    for t in ts:
+        try:
+            yield from candidates(depth, t, v)
+        except (TypeError, ValueError, AttributeError):
+            pass
+
+LEAVES = {
+    ds.IntStrat: _int,
+    ds.NatStrat: _nat,
+    ds.NegStrat: _neg,
+    ds.Word2Strat: _nat,
+    ds.Word4Strat: _nat,
+    ds.Word8Strat: _nat,
+    ds.StrStrat: _str,
+    ds.BoolStrat: _bool,
+}
+
+CONSTRUCTORS = {
+    ds.ListStrat: _list,
+    ds.SetStrat: _set,
+    ds.TupleStrat: _tuple,
+    ds.UnionStrat: _union,
+}
+
+def candidates(depth, t, v):
+    '''Generate values of type `t` smaller than `v`, smallest first
+
+    Values of types without a built-in strategy are never shrunk
+    '''
+    try:
+        strat = strategy.get_strat_instance(t)
+    except _errors.MissingStrategyError:
+        return
+
+    if strat in LEAVES:
+        yield from LEAVES[strat](v)
+        return
+
+    # of an implies(), the candidates of the type it is over that it holds for
+    implied = vars(strat).get('__implies__')
+    if implied is not None:
+        holds, base = implied
+        yield from filter(holds, candidates(depth, base, v))
+        return
+
+    # as in compiled._compile, not for strategies derived from a generated one
+    origin = vars(strat).get('__generated_from__')
+    if origin in CONSTRUCTORS:
+        typ = typeable.from_type(t)
+        yield from CONSTRUCTORS[origin](depth, v, *(a.typ for a in typ.args))
+
+def _candidates(depth, t, v):
+    '''As :func:`candidates`, but stopping at the first error
+    e.g. from a value the shrinkers for `t` do not expect
+    '''
+    cs = candidates(depth, t, v)
+    while True:
+        try:
+            c = next(cs)
+        except StopIteration:
+            return
+        except Exception as e:
+            log.debug('cannot shrink {} any further: {!r}'.format(v, e))
+            return
+        yield c
+
+def shrink(depth, t, v, fails, budget=100):
+    '''Greedily shrink the counterexample `v` of type `t`
+
+    Tries each of the :func:`candidates` smaller than `v` in turn, calling `fails(c)` to re-run
+    the property on candidate `c`, moving to the first candidate that still fails and starting again,
+    until no candidate fails or `budget` candidates have been tried.
+
+    Returns a :class:`Shrink`
+    '''
+    result = Shrink(original=v, value=v)
+    seen = [v]
+
+    shrunk = True
+    while shrunk:
+        shrunk = False
+        for c in _candidates(depth, t, result.value):
+            if result.evaluations >= budget:
+                return result
+
+            # never go back to a previous counterexample
+            if c in seen:
+                continue
+
+            result.evaluations += 1
+            if fails(c):
+                log.debug('shrunk {} to {}'.format(result.value, c))
+                seen.append(c)
+                result.value = c
+                result.steps.append(c)
+                shrunk = True
+                break
+
+    return result
@@ -0,0 +1,128 @@
+# sourcehash.py - Hashing the code behind a property, to tell when it has changed
+import sys
+import types
+import hashlib
+import inspect
+
+from . import profiling
+
+__all__ = [
+    'code_hash',
+]
+
+# values whose repr() is stable between runs
+_SIMPLE = (int, float, complex, str, bytes, bool, type(None))
+
+def _is_user(obj):
+    '''Whether `obj` (a function or class) is defined in the user's code
+    rather than speccer, the standard library or an installed package
+    '''
+    try:
+        filename = inspect.getfile(obj)
+    except TypeError:
+        return False
+    return profiling._category(filename) == 'user'
+
+class _Hasher:
+    def __init__(self):
+        self._h = hashlib.sha256()
+        self._seen = set()
+
+    def _update(self, *parts):
+        for p in parts:
+            self._h.update(repr(p).encode())
+            self._h.update(b'\0')
+
+    def value(self, v):
+        if isinstance(v, _SIMPLE):
+            self._update(v)
+        elif isinstance(v, (tuple, list, frozenset, set)):
+            self._update(type(v).__name__, len(v))
+            for x in (sorted(v, key=repr) if isinstance(v, (set, frozenset)) else v):
+                self.value(x)
+        elif isinstance(v, types.CodeType):
+            self.code(v, {})
+        elif isinstance(v, (types.FunctionType, type)):
+            self.obj(v)
+        elif isinstance(v, (staticmethod, classmethod)):
+            self.value(v.__func__)
+        elif isinstance(v, property):
+            for f in (v.fget, v.fset, v.fdel):
+                self.value(f)
+        elif isinstance(v, (types.BuiltinFunctionType, types.ModuleType)):
+            self._update(getattr(v, '__module__', None), getattr(v, '__qualname__', v.__name__))
+        else:
+            self._update(type(v).__qualname__)
+
+    def code(self, co, globals):
+        self._update(co.co_name, co.co_argcount, co.co_kwonlyargcount, co.co_flags, co.co_names, co.co_varnames)
+        self._h.update(co.co_code)
+        for c in co.co_consts:
+            if isinstance(c, types.CodeType):
+                self.code(c, globals)
+            else:
+                self.value(c)
+
+        # the globals it refers to, and their dependencies in turn
+        for name in co.co_names:
+            if name in globals:
+                self._update(name)
+                self.value(globals[name])
+
+    def cells(self, f):
+        for cell in f.__closure__ or ():
+            try:
+                self.value(cell.cell_contents)
+            except ValueError:
+                # an empty cell
+                self._update('<empty>')
+
+    def obj(self, obj):
+        if id(obj) in self._seen:
+            self._update('<seen>', getattr(obj, '__qualname__', None))
+            return
+        self._seen.add(id(obj))
+
+        if not _is_user(obj):
+            # speccer, the standard library, or a package: identified by name
+            # but closures can carry the user's code into them, e.g. the predicate of ops.implies
+            self._update('extern', obj.__module__, obj.__qualname__)
+            if isinstance(obj, type):
+                for _, v in sorted(vars(obj).items()):
+                    if isinstance(v, types.FunctionType):
+                        self.cells(v)
+            else:
+                self.cells(obj)
+            return
+
+        if isinstance(obj, type):
+            self._update('class', obj.__module__, obj.__qualname__)
+            for b in obj.__bases__:
+                self.value(b)
+            for name, v in sorted(vars(obj).items()):
+                if not (name.startswith('__') and name.endswith('__')):
+                    self._update(name)
+                    self.value(v)
+            return
+
+        self._update('function', obj.__module__, obj.__qualname__)
+        self.code(obj.__code__, obj.__globals__)
+        self.value(obj.__defaults__)
+        self.cells(obj)
+
+    def hexdigest(self):
+        return self._h.hexdigest()
+
+def code_hash(*objs):
+    '''A hash of the code of the functions and classes `objs`
+    and of the user's functions, classes and simple values they refer to, recursively
+
+    Stable between runs of the same Python version, and changes when any of that code does.
+    Things defined outside the user's code (in speccer, the standard library or installed packages)
+    are hashed by name, and the values their closures refer to.
+    '''
+    h = _Hasher()
+    h._update(sys.version_info[:2])
+    for obj in objs:
+        h.value(obj)
+    return h.hexdigest()
@@ -1,7 +1,9 @@
 import attr
 
 import sys
+import time
 import types
+import random
 import functools
 import traceback
 
@@ -10,6 +12,12 @@ from . import strategy
 from . import model
 from . import pset
 from . import config
+from . import runtime
+from . import reporting
+from . import instrument
+from . import profiling
+from . import parallel
+from . import cache
 
 @attr.s
 class Options:
@@ -18,6 +26,102 @@ class Options:
     args = attr.ib(default=[])
     output_file = attr.ib(default=sys.stdout)
 
+    # also stream events as JSON Lines to this file, see speccer.reporting
+    json_file = attr.ib(default=None)
+
+    # any other reporting.Reporter's to send events to
+    reporters = attr.ib(default=attr.Factory(list))
+
+    # progress shown while a property runs, see TextReporter
+    # 'dots', 'status' (a single updating line), None for none, or 'auto' for 'status' on a TTY and none otherwise
+    # updated at most every progress_interval seconds
+    progress = attr.ib(default='auto')
+    progress_interval = attr.ib(default=0.1)
+
+    # draw values from compiled strategies, see speccer.compiled
+    compiled = attr.ib(default=False)
+
+    # test this many randomly drawn values per quantifier, see speccer.sampling
+    # instead of every value up to the depth, reproducible from the seed
+    samples = attr.ib(default=None)
+    seed = attr.ib(default=None)
+
+    # shrink counterexamples to forall properties, see speccer.shrinking
+    # re-running the property at most shrink_budget times
+    shrink = attr.ib(default=False)
+    shrink_budget = attr.ib(default=100)
+
+    # skip values each quantifier has already tested, see speccer.dedup
+    dedup = attr.ib(default=False)
+
+    # run the cheaper side of `p & q' and `p | q' first
+    # based on the time per case measured in previous runs
+    cost_order = attr.ib(default=False)
+
+    # count values generated and time spent generating and evaluating, see speccer.instrument
+    instrument = attr.ib(default=False)
+
+    # profile the run of each property, see speccer.profiling
+    # with 'cprofile' or 'sample', writing a file per property into profile_dir
+    # profile_only is the names of the properties to profile, or None for all of them
+    profile = attr.ib(default=None)
+    profile_dir = attr.ib(default='.')
+    profile_only = attr.ib(default=None)
+    profile_interval = attr.ib(default=0.001)
+
+    # worker processes to run the properties of a PropertySet across
+    # 0 to run them one after another in this process, None for one per CPU
+    processes = attr.ib(default=0)
+
+    # skip properties that passed before and are unchanged since, see speccer.cache
+    # keeping the results in cache_dir (None for cache.DEFAULT_PATH)
+    # not used when sampling, as a sampled run does not test every value
+    cache = attr.ib(default=False)
+    cache_dir = attr.ib(default=None)
+
+    def __attrs_post_init__(self):
+        if self.seed is None:
+            self.seed = random.randrange(2**32)
+
+    def runtime(self):
+        '''The :class:`runtime.Runtime` settings for running a property
+        '''
+        return runtime.Runtime(
+            compiled=self.compiled,
+            samples=self.samples,
+            random=random.Random(self.seed),
+            shrink=self.shrink,
+            shrink_budget=self.shrink_budget,
+            dedup=self.dedup,
+            cost_order=self.cost_order,
+            stats=instrument.Stats() if self.instrument else None)
+
+    def make_reporters(self):
+        '''The :class:`reporting.Reporter`'s to send the events of a run to
+        '''
+        reporters = []
+        if self.output_file is not None:
+            reporters.append(TextReporter(self.output_file, progress=self.progress, interval=self.progress_interval))
+        if self.json_file is not None:
+            reporters.append(reporting.JSONLinesReporter(self.json_file))
+        return reporters + self.reporters
+
+    def result_cache(self):
+        '''The :class:`cache.ResultCache` to consult and record results in, or None
+        '''
+        if not self.cache or self.samples is not None:
+            return None
+        return cache.ResultCache(self.cache_dir or cache.DEFAULT_PATH)
+
+    def profiler(self, prop):
+        '''The profiler to run `prop` under, or None
+        '''
+        if self.profile is None:
+            return None
+        if self.profile_only is not None and prop.name not in self.profile_only:
+            return None
+        return profiling.profiler(self.profile, prop.name, directory=self.profile_dir, interval=self.profile_interval)
+
 @functools.lru_cache(32)
 def _find_ancestors(outcome):
     parents = []
@@ -46,6 +150,17 @@ def _print_reason(outcome, outfile=sys.stdout):
         outfile.write('\n')
         outfile.write(' failure reason: {}\n'.format(outcome.message))
 
+def _print_shrink(outcome, outfile=sys.stdout):
+    shrunk = outcome.state.get('shrink')
+    if not shrunk:
+        return
+
+    outfile.write('\n')
+    outfile.write(' shrunk from {} in {} step(s) ({} evaluation(s)):\n'.format(
+        shrunk.original, len(shrunk.steps), shrunk.evaluations))
+    for v in shrunk.steps:
+        outfile.write(' >  {}\n'.format(v))
+
 def _print_parents(outcome, outfile=sys.stdout):
     _parents = _find_ancestors(outcome)
     for p in reversed(_parents):
@@ -73,16 +188,48 @@ def _print_prop_summary(prop, outcome, outfile=sys.stdout):
     else:
         outfile.write('After {} call(s)\n'.format(n))
     outfile.write('To depth {}\n'.format(depth))
+    if outcome.state.get('duplicates'):
+        outfile.write('Skipped {} duplicate value(s)\n'.format(outcome.state['duplicates']))
+    if outcome.state.get('memo'):
+        hits, lookups = outcome.state['memo']
+        outfile.write('Memoised {} of {} pure call(s) ({:.0%})\n'.format(hits, lookups, hits / lookups))
+    if 'seed' in outcome.state:
+        outfile.write('Sampled with seed {}\n'.format(outcome.state['seed']))
+    if 'stats' in outcome.state:
+        _print_stats(outcome.state['stats'], outfile=outfile)
+    if 'profile' in outcome.state:
+        _print_profile(outcome.state['profile'], outfile=outfile)
     outfile.write('In property `{}`\n'.format(name))
     outfile.write('\n')
 
 
+def _print_stats(stats, outfile=sys.stdout):
+    rate = stats.cases_per_sec
+    outfile.write('Ran {} case(s) in {:.3f}s{}\n'.format(
+        stats.cases, stats.elapsed, ' ({:.0f} cases/sec)'.format(rate) if rate else ''))
+    outfile.write(' generating values {:.3f}s, in property functions {:.3f}s ({} assertion(s) {:.3f}s)\n'.format(
+        stats.generate_time, stats.predicate_time, stats.assertions, stats.assertion_time))
+    for name, count in stats.strategy_values.most_common():
+        outfile.write(' >  {} generated {} value(s) in {:.3f}s\n'.format(name, count, stats.strategy_time[name]))
+    if stats.pairgen_max_heap:
+        outfile.write(' largest PairGen queue {}\n'.format(stats.pairgen_max_heap))
+
+def _print_profile(profile, outfile=sys.stdout):
+    outfile.write('Profiled to {}\n'.format(profile.path))
+    if profile.total:
+        outfile.write(' {:.0%} in speccer, {:.0%} in user code, {:.0%} other\n'.format(
+            profile.speccer / profile.total, profile.user / profile.total, profile.other / profile.total))
+
 def _print_success(prop, depth, success, outfile=sys.stdout):
     outfile.write('-' * 80 + '\n')
 
     if isinstance(success, clauses.NoCounter):
         outfile.write('Found no counterexample\n')
         _print_prop_summary(prop, success, outfile=outfile)
+    elif isinstance(success, clauses.CachedSuccess):
+        outfile.write('Unchanged since it passed to depth {}, not run\n'.format(success.state['depth']))
+        outfile.write('In property `{}`\n'.format(prop.name))
+        outfile.write('\n')
     elif isinstance(success, clauses.Witness):
         outfile.write('Found witness\n')
         _print_prop_summary(prop, success, outfile=outfile)
@@ -107,6 +254,7 @@ def _print_failure(prop, depth, failure, outfile=sys.stdout):
         outfile.write(' counterexample:\n')
         _print_arg(failure.reason, outfile=outfile)
         _print_reason(failure, outfile=outfile)
+        _print_shrink(failure, outfile=outfile)
     elif isinstance(failure, clauses.UnrelatedException):
         outfile.write(' exception:\n')
         outfile.write('\n')
@@ -125,6 +273,95 @@ def _pretty_print(prop, depth, outcome, outfile=sys.stdout):
     else:
         _print_failure(prop, depth, outcome, outfile=outfile)
 
+def _isatty(f):
+    try:
+        return f.isatty()
+    except (AttributeError, ValueError):
+        return False
+
+class TextReporter(reporting.Reporter):
+    '''Prints the progress of each property as it runs, and a human readable summary of each outcome
+
+    progress is one of
+        'dots': a dot per progress event, `(xN)` when the events become every N cases
+        'status': a single line, rewritten in place, with the number of cases ran and cases/sec
+        'auto': 'status' if `outfile` is a TTY, otherwise no progress
+        None: no progress
+
+    Progress is written at most every `interval` seconds, dots in between are buffered
+    '''
+    def __init__(self, outfile, progress='auto', interval=0.1):
+        self.outfile = outfile
+        self.interval = interval
+        if progress == 'auto':
+            progress = 'status' if _isatty(outfile) else None
+        self.mode = progress
+
+        self._scale = 1
+        self._dots = 0
+        self._pending = []
+        self._last = None
+        self._width = 0
+
+    def start(self, prop, depth):
+        self._scale = 1
+        self._dots = 0
+        self._pending = []
+        self._last = None
+        self._width = 0
+
+    def _flush_dots(self):
+        if self._pending:
+            self.outfile.write(''.join(self._pending))
+            self.outfile.flush()
+            self._pending = []
+
+    def progress(self, prop, depth, calls, scale, elapsed):
+        if self.mode == 'dots':
+            self._dots += 1
+            self._pending.append('.')
+
+            if scale != self._scale:
+                self._scale = scale
+                self._pending.append('(x{})'.format(scale))
+
+            if self._dots % 80 == 0:
+                self._pending.append('\n')
+        elif self.mode != 'status':
+            return
+
+        if self._last is not None and elapsed - self._last < self.interval:
+            return
+        self._last = elapsed
+
+        if self.mode == 'dots':
+            self._flush_dots()
+        else:
+            line = '{}: {} case(s)'.format(prop.name, calls)
+            if elapsed > 0:
+                line += ', {:.0f} cases/sec'.format(calls / elapsed)
+            self.outfile.write('\r' + line.ljust(self._width))
+            self.outfile.flush()
+            self._width = len(line)
+
+    def finish(self, prop, depth, outcome, calls, scale, elapsed):
+        outfile = self.outfile
+        if self.mode == 'dots':
+            self._flush_dots()
+            if calls % scale != 0:
+                print('…', end='', file=outfile)
+
+            if isinstance(outcome, clauses.UnrelatedException):
+                print('E', file=outfile)
+            elif isinstance(outcome, clauses.Failure):
+                print('F', file=outfile)
+            else:
+                print('', file=outfile)
+        elif self.mode == 'status' and self._width:
+            outfile.write('\r' + ' ' * self._width + '\r')
+
+        _pretty_print(prop, depth, outcome, outfile=outfile)
+
 def spec(depth, prop, options):
     '''Run `speccer` on given :class:`Property` 'prop' or some iterable of properties 'prop'
     to depth 'depth'
@@ -153,8 +390,9 @@ def spec(depth, prop, options):
     return out
 
 def _spec(depth, prop_or_prop_set, options):
+    source = None
     if callable(prop_or_prop_set):
-        f = prop_or_prop_set
+        source = f = prop_or_prop_set
         prop_or_prop_set = prop_or_prop_set(*options.args)
         prop_or_prop_set.name = f.__name__
 
@@ -163,22 +401,65 @@ def _spec(depth, prop_or_prop_set, options):
 
     if isinstance(prop_or_prop_set, clauses.Property):
         with strategy.generation_graph.push_node(name=str(prop_or_prop_set)):
-            return _spec_prop(depth, prop_or_prop_set, options=options)
+            return _spec_prop(depth, prop_or_prop_set, options=options, source=source)
+    elif isinstance(prop_or_prop_set, pset.PropertySet):
+        return _spec_pset(depth, prop_or_prop_set, options=options)
     else:
         try:
             with strategy.generation_graph.push_node(name=str(prop_or_prop_set)):
                 for p in prop_or_prop_set:
-                    print('p=', p)
                     out = _spec(depth, p, options=options)
-                    if isinstance(out, clauses.Failure):
+                    if _failed(out):
                         return out
 
-                    options.output_file.write('~' * 80)
-                    options.output_file.write('\n')
+                    if options.output_file is not None:
+                        options.output_file.write('~' * 80)
+                        options.output_file.write('\n')
         except TypeError:
             raise
     return clauses.UnitSuccess(None)  # TODO: Better output for propsets?
 
+def _failed(out):
+    '''Whether the outcome of :func:`_spec` `out` is a failure
+    '''
+    if isinstance(out, parallel.PropertySetResult):
+        return not out.ok
+    return isinstance(out, clauses.Failure)
+
+def _spec_pset(depth, ps, options):
+    '''Run every property of `ps`, see :func:`parallel.run_property_set`
+    then write out their reports in order followed by a summary of them all
+    '''
+    result = parallel.run_property_set(depth, ps, options, processes=options.processes)
+
+    outfile = options.output_file
+    for r in result.results:
+        if options.json_file is not None and r.events:
+            options.json_file.write(r.events)
+            options.json_file.flush()
+
+        if outfile is not None:
+            outfile.write(r.report)
+            outfile.write('~' * 80)
+            outfile.write('\n')
+
+    if outfile is not None:
+        _print_pset_summary(result, outfile=outfile)
+
+    return result
+
+def _print_pset_summary(result, outfile=sys.stdout):
+    outfile.write('=' * 80 + '\n')
+    outfile.write('Ran {} properties of `{}` in {:.3f}s ({:.3f}s in total)\n'.format(
+        len(result.results), result.name, result.elapsed, sum(r.elapsed for r in result.results)))
+    for r in result.results:
+        outfile.write(' {:<40} {:<5} {:>10} call(s) {:>9.3f}s\n'.format(r.name, r.result, r.calls, r.elapsed))
+
+    if result.ok:
+        outfile.write('\nOK\n')
+    else:
+        outfile.write('\nFAIL ({} failed, {} errors)\n'.format(result.failed, result.errors))
+
 def _get_outcome(p):
     try:
         while True:
@@ -186,53 +467,90 @@ def _get_outcome(p):
     except StopIteration as e:
         return e.value
 
-def _spec_prop(depth, prop, options):
+def _spec_prop(depth, prop, options, source=None):
     # reset property state
     # just incase it has been run before
     outfile = options.output_file
     prop.reset_implications()
 
+    # source is the function prop was made by, if any, see cache.ResultCache
+    results = options.result_cache()
+    if results is not None and results.passed(prop, depth, source):
+        outcome = clauses.CachedSuccess(prop)
+        outcome.state['depth'] = depth
+        for r in options.make_reporters():
+            r.start(prop, depth)
+            r.finish(prop, depth, outcome, 0, 1, 0.0)
+        return outcome
+
+    with runtime.change_runtime(options.runtime()):
+        outcome = _run_prop(depth, prop, options)
+
+    if results is not None:
+        results.record(prop, depth, outcome, source)
+    return outcome
+
+def _run_prop(depth, prop, options):
+    reporters = options.make_reporters()
+    for r in reporters:
+        r.start(prop, depth)
+
+    profiler = options.profiler(prop)
+    if profiler is not None:
+        profiler.start()
+
+    t0 = time.perf_counter()
     outs = run_clause(depth, prop)
     n = 0
     d = 1
-    dots = 0
-    passes = []
     try:
         while True:
             try:
-                passes.append(next(outs))
+                next(outs)
             except StopIteration:
                 raise
             except Exception as e:
                 raise StopIteration(clauses.UnrelatedException(prop, e))
 
+            # report progress every d cases, d growing by powers of 10
             if n % d == 0:
-                dots += 1
-                print('.', flush=True, end='', file=outfile)
+                if n == d*10:
+                    d *= 10
 
-            if n == d*10:
-                d *= 10
-                print('(x{})'.format(d), flush=True, end='', file=outfile)
+                if reporters:
+                    elapsed = time.perf_counter() - t0
+                    for r in reporters:
+                        r.progress(prop, depth, n, d, elapsed)
 
             n += 1
-            if dots % 80 == 0:
-                print('', file=outfile)
     except StopIteration as e:
         outcome = e.value
+        if profiler is not None:
+            outcome.state['profile'] = profiler.stop()
+            profiler = None
+
         outcome.state['calls'] = n
         outcome.state['depth'] = depth
-
-        if n % d != 0:
-            print('…', end='', file=outfile)
-
-        if isinstance(outcome, clauses.UnrelatedException):
-            print('E', file=outfile)
-        elif isinstance(outcome, clauses.Failure):
-            print('F', file=outfile)
-        else:
-            print('', file=outfile)
-
-        _pretty_print(prop, depth, outcome, outfile=outfile)
+        if options.samples is not None:
+            outcome.state['seed'] = options.seed
+        if options.dedup:
+            outcome.state['duplicates'] = runtime.CURRENT.duplicates
+
+        rt = runtime.CURRENT
+        if rt.stats is not None:
+            rt.stats.cases = n
+            rt.stats.elapsed = time.perf_counter() - t0
+            outcome.state['stats'] = rt.stats
+
+        if rt.memo_hits + rt.memo_misses:
+            outcome.state['memo'] = (rt.memo_hits, rt.memo_hits + rt.memo_misses)
+
+        elapsed = time.perf_counter() - t0
+        for r in reporters:
+            r.finish(prop, depth, outcome, n, d, elapsed)
+    finally:
+        if profiler is not None:
+            profiler.stop()
 
     return outcome
 
@@ -3,6 +3,7 @@
 #from __future__ import generator_stop
 
 import abc
+import time
 import heapq
 import logging
 import inspect
@@ -13,8 +14,10 @@ from . import _errors
 from . import grapher
 from . import typeable
 from . import ops
+from . import runtime
 
 generation_graph = grapher.Graph()
+log = logging.getLogger('strategy')
 
 __all__ = [
     'Strategy',
@@ -69,6 +72,10 @@ class PairGen:
         if not self._pq:
             raise StopIteration
 
+        stats = runtime.CURRENT.stats
+        if stats is not None and len(self._pq) > stats.pairgen_max_heap:
+            stats.pairgen_max_heap = len(self._pq)
+
         pair = heapq.heappop(self._pq)
         t = pair.x
 
@@ -89,11 +96,8 @@ class PairGen:
         return t
 
 def generate_args_from_strategies(*iters):
-    log = logging.getLogger('generate_args_from_strategies({})'.format(iters))
-
     gens = collections.deque(map(iter, iters))
     n = len(gens)
-    log.debug('n={}'.format(n))
 
     values = [[] for _ in range(n)]
     ds = collections.deque(enumerate(values))
@@ -111,8 +115,6 @@ def generate_args_from_strategies(*iters):
                 except StopIteration:
                     return
 
-            log.debug('values = {}, t = {}'.format(values, pair_next))
-
             t = ()
             for i in range(n):
                 j = pair_next[i]
@@ -147,6 +149,34 @@ def generate_args_from_strategies(*iters):
     if c >= n:
         yield from _check()
 
+def product_indices(*counts):
+    '''The index tuples that :func:`generate_args_from_strategies` picks values at
+    when given iterators yielding `counts` values each, in the same order
+
+    i.e. the k-th tuple generate_args_from_strategies(*iters) yields is
+        tuple(list(it)[i] for it, i in zip(iters, nth(product_indices(*counts), k)))
+    '''
+    n = len(counts)
+    sizes = [0] * n
+    live = collections.deque(range(n))
+    pair_gen = PairGen(n=n)
+    c = 0
+
+    while live:
+        i = live.popleft()
+        if sizes[i] >= counts[i]:
+            continue
+
+        sizes[i] += 1
+        pair_gen.update(i)
+        c += 1
+        live.append(i)
+        if c >= n:
+            yield from pair_gen
+
+    if c >= n:
+        yield from pair_gen
+
 def has_strat_instance(t):
     try:
         Strategy.get_strat_instance(t)
@@ -167,6 +197,35 @@ def register(t, strategy, override=True):
         raise ValueError
 
     StratMeta.__strats__[t] = strategy
+    for cache in _caches:
+        cache.clear()
+
+# cache of get_strat_instance lookups, keyed on _cache_key(t)
+# a value of MissingStrategyError means there is no strategy for that type
+_resolved = {}
+
+# caches derived from the registered strategies, cleared by register()
+_caches = [_resolved]
+
+def register_cache(cache):
+    '''Register some dict `cache` to be cleared whenever a strategy is registered
+    '''
+    _caches.append(cache)
+
+def _cache_key(t):
+    '''A hashable key for type `t`
+
+    Literal aliases like [int] or {int} are unhashable so are converted to tuples
+    '''
+    if isinstance(t, typeable.Typeable):
+        return _cache_key(t.typ)
+    elif isinstance(t, list):
+        return (list,) + tuple(map(_cache_key, t))
+    elif isinstance(t, set):
+        return (set, frozenset(map(_cache_key, t)))
+    elif isinstance(t, tuple):
+        return (tuple,) + tuple(map(_cache_key, t))
+    return t
 
 def _pprint_stack(stack):
     print('; '.join([
@@ -226,9 +285,26 @@ class StratMeta(abc.ABCMeta):
             subtype=t)
 
     def get_strat_instance(self, t):
+        try:
+            key = _cache_key(t)
+            s = _resolved[key]
+        except TypeError:  # some other unhashable type, cannot cache it
+            return self._resolve_strat_instance(t)
+        except KeyError:
+            try:
+                s = _resolved[key] = self._resolve_strat_instance(t)
+            except _errors.MissingStrategyError:
+                _resolved[key] = _errors.MissingStrategyError
+                raise
+
+        if s is _errors.MissingStrategyError:
+            raise _errors.MissingStrategyError('Cannot get Strategy instance for ~{}'.format(t))
+
+        return s
+
+    def _resolve_strat_instance(self, t):
         # see if we have an instance for t, outright
-        log = logging.getLogger('strategy.getStratInstance({t})'.format(t=t))
-        log.debug('get')
+        log.debug('getStratInstance({t})'.format(t=t))
         try:
             if isinstance(t, typeable.Typeable):
                 return StratMeta.__strats__[t.typ]
@@ -253,47 +329,74 @@ class StratMeta(abc.ABCMeta):
             log.debug('new type, with origin={origin}'.format(origin=strat_origin))
 
             def generate(self, d, *args, **kwargs):
-                log.debug('generate(depth={d}, *{args}, **{kwargs})'.format(d=d, args=args, kwargs=kwargs))
                 new_args = [a.typ for a in typ.args] + list(args)
                 yield from strat_origin(d, *new_args, **kwargs)
 
+            def count(self, d, *args):
+                new_args = [a.typ for a in typ.args] + list(args)
+                return strat_origin(d, *new_args).count(d, *new_args)
+
+            def nth(self, d, k, *args):
+                new_args = [a.typ for a in typ.args] + list(args)
+                return strat_origin(d, *new_args).nth(d, k, *new_args)
+
             args = ', '.join(t.pretty() for t in typ.args) # TODO: make this use typeable
             name = 'Generated_{}[{}]'.format(strat_origin.__name__, args)
-            GenStrat = type(name, (s,), dict(generate=generate))
+            GenStrat = type(name, (s,), dict(generate=generate, count=count, nth=nth))
             GenStrat.__module__ = strat_origin.__module__
+            GenStrat.__generated_from__ = strat_origin
             StratMeta.__strats__[typ.typ] = GenStrat
             return GenStrat
         raise _errors.MissingStrategyError('Cannot get Strategy instance for ~{}'.format(t))
 
+# keyword parameters accepted by each generate() function
+# generate -> (frozenset of parameter names, whether it takes **kwargs)
+_generate_keywords = {}
+
+def _get_generate_keywords(generate):
+    try:
+        return _generate_keywords[generate]
+    except KeyError:
+        pass
+
+    params = inspect.signature(generate).parameters
+    var_kw = any(p.kind == inspect.Parameter.VAR_KEYWORD for p in params.values())
+    kws = _generate_keywords[generate] = (frozenset(params), var_kw)
+    return kws
+
 class StrategyIterator:
     def __init__(self, strat):
-        self.log = logging.getLogger('strategy.StrategyIterator({})'.format(str(strat)))
         self.strategy = strat
-        sig = inspect.signature(strat.generate)
-        params = sig.parameters
-        kws = {}
-        self.log.debug('init')
-        for kw in params:
-            if kw in strat._kws:
-                self.log.debug('add keyword {kw}'.format(kw=kw))
-                kws[kw] = strat._kws[kw]
-            elif params[kw].kind == inspect.Parameter.VAR_KEYWORD:
-                self.log.debug('merge keywords on VAR_KEYWORD {kw}'.format(kw=kw))
-                kws.update(strat._kws)
-                break
+        kws = strat._kws
+
+        # only pass on the keywords that generate() accepts
+        if kws:
+            names, var_kw = _get_generate_keywords(type(strat).generate)
+            if not var_kw:
+                kws = {kw: v for kw, v in kws.items() if kw in names}
 
         self._generator = strat.generate(strat._depth, *strat._args, **kws)
 
     def __next__(self):
-        self.log.debug('next()'.format(strat=self.strategy))
         if self.strategy._depth > 0:
+            stats = runtime.CURRENT.stats
+            if stats is not None:
+                t = time.perf_counter()
+
             with generation_graph.push_node(label=str(self.strategy)) as n:
                 try:
                     v = next(self._generator)
                 except _errors.FailedAssumption:
                     print('e: failed assumption')
                     raise RuntimeError('e: failed assumption, NotImplemented')
+                finally:
+                    if stats is not None:
+                        name = type(self.strategy).__name__
+                        stats.strategy_time[name] += time.perf_counter() - t
                 n.name = str(v)
+
+                if stats is not None:
+                    stats.strategy_values[name] += 1
                 return v
         # with PEP479 this will not automatically stop the parent generator
         # it is important therefore to wrap the generator next() call in a try
@@ -314,9 +417,6 @@ class Strategy(metaclass=StratMeta):
     '''
 
     def __init__(self, depth, *args, **kws):
-        self.log = logging.getLogger('strategy.{}'.format(str(self)))
-        self.log.debug('{}.new({})'.format(self.__class__.__name__, depth))
-        self._nodes = []
         self._depth = depth
         self._args = args
         self._kws = kws
@@ -328,6 +428,26 @@ class Strategy(metaclass=StratMeta):
         Allows extra args for higher-kinded types
         '''
 
+    def count(self, depth, *type_params):
+        '''The number of values generate(depth, *type_params) yields
+        or None if it cannot be known without generating them all
+
+        Strategies which override `count' should also override `nth'
+        '''
+        return None
+
+    def nth(self, depth, k, *type_params):
+        '''The k-th value that generate(depth, *type_params) yields
+        raising IndexError if there is no such value
+
+        By default this generates the first k values
+        '''
+        for i, v in enumerate(type(self)(depth, *type_params)):
+            if i == k:
+                return v
+
+        raise IndexError(k)
+
     def __iter__(self):
         return StrategyIterator(self)
 
@@ -1,5 +1,6 @@
 import attr
 import typing
+import functools
 
 @attr.s
 class Typeable:
@@ -10,7 +11,8 @@ class Typeable:
 
     def pretty(self):
         if not self.origin:
-            name = self.typ.__name__
+            # some typing special forms (e.g. Union) have no __name__
+            name = getattr(self.typ, '__name__', None) or repr(self.typ).replace('typing.', '')
         else:
             name = self.origin.pretty()
 
@@ -76,3 +78,30 @@ def get_arity(origin, args=[]):
         return 1 - (1 if args else 0)
 
     return 0
+
+
+def is_subtype(t, other):
+    '''Returns True if values of type `t` can be used where an `other` is expected
+
+    Plain classes are compared with issubclass, generic types must be equal.
+    '''
+    try:
+        return _is_subtype(t, other)
+    except TypeError:  # unhashable, i.e. a literal alias like [int]
+        return _is_subtype.__wrapped__(t, other)
+
+@functools.lru_cache(maxsize=1024)
+def _is_subtype(t, other):
+    t = from_type(t)
+    other = from_type(other)
+
+    if t.typ == other.typ:
+        return True
+
+    if t.origin is not None or other.origin is not None:
+        return False
+
+    try:
+        return issubclass(t.typ, other.typ)
+    except TypeError:
+        return False
@@ -0,0 +1,128 @@
+import io
+import os
+import sys
+import subprocess
+
+from speccer import spec, forall, cache, clauses, strategy
+from speccer import __main__
+
+# not prop_* so the pytest plugin does not collect them
+def _prop_ok():
+    return forall(int, lambda x: x == x)
+
+def _prop_bad():
+    return forall(int, lambda x: x < 2)
+
+def run(p, tmpdir, cache=True, **options):
+    return spec(3, p, outfile=io.StringIO(), cache=cache, cache_dir=str(tmpdir), **options)
+
+def test_skips_unchanged_pass(tmpdir):
+    assert isinstance(run(_prop_ok, tmpdir), clauses.NoCounter)
+    assert isinstance(run(_prop_ok, tmpdir), clauses.CachedSuccess)
+    assert isinstance(run(_prop_ok, tmpdir, cache=False), clauses.NoCounter)
+
+def test_does_not_cache_failures(tmpdir):
+    assert isinstance(run(_prop_bad, tmpdir), clauses.Counter)
+    assert isinstance(run(_prop_bad, tmpdir), clauses.Counter)
+
+def test_depth_is_part_of_the_key(tmpdir):
+    run(_prop_ok, tmpdir)
+    out = spec(4, _prop_ok, outfile=None, cache=True, cache_dir=str(tmpdir))
+    assert isinstance(out, clauses.NoCounter)
+
+def test_changed_function_reruns(tmpdir):
+    results = cache.ResultCache(str(tmpdir))
+    p = forall(int, lambda x: x == x, name='p')
+    results.record(p, 3, clauses.NoCounter(p, []))
+    assert results.passed(p, 3)
+
+    q = forall(int, lambda x: x + 0 == x, name='p')
+    assert not results.passed(q, 3)
+
+def test_direct_property(tmpdir):
+    assert isinstance(run(forall(int, lambda x: x == x), tmpdir), clauses.NoCounter)
+    assert isinstance(run(forall(int, lambda x: x == x), tmpdir), clauses.CachedSuccess)
+    assert len(tmpdir.listdir()) == 1
+
+def test_same_name_in_other_module(tmpdir, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmpdir))
+    tmpdir.join('same_a.py').write('from speccer import forall\ndef prop_same():\n    return forall(int, lambda x: True)\n')
+    tmpdir.join('same_b.py').write('from speccer import forall\ndef prop_same():\n    return forall(int, lambda x: False)\n')
+    import same_a, same_b
+
+    cache_dir = tmpdir.join('cache')
+    assert isinstance(run(same_a.prop_same, cache_dir), clauses.NoCounter)
+    assert isinstance(run(same_b.prop_same, cache_dir), clauses.Counter)
+    assert isinstance(run(same_a.prop_same, cache_dir), clauses.CachedSuccess)
+
+def test_nested_strategy_change(tmpdir):
+    class A:
+        pass
+
+    class AStrat(strategy.Strategy[A]):
+        def generate(self, depth):
+            yield A()
+
+    def prop_nested():
+        return forall(int, lambda x: forall(A, lambda a: True))
+
+    assert isinstance(run(prop_nested, tmpdir), clauses.NoCounter)
+    assert isinstance(run(prop_nested, tmpdir), clauses.CachedSuccess)
+
+    class OtherAStrat(strategy.Strategy[A]):
+        def generate(self, depth):
+            yield A()
+            yield A()
+
+    assert isinstance(run(prop_nested, tmpdir), clauses.NoCounter)
+
+def test_invalidate(tmpdir):
+    run(_prop_ok, tmpdir)
+    cache.invalidate('_prop_ok', path=str(tmpdir))
+    assert isinstance(run(_prop_ok, tmpdir), clauses.NoCounter)
+
+    cache.invalidate('other_module._prop_ok', path=str(tmpdir))
+    assert isinstance(run(_prop_ok, tmpdir), clauses.CachedSuccess)
+
+    cache.invalidate('test_cache._prop_ok', path=str(tmpdir))
+    assert isinstance(run(_prop_ok, tmpdir), clauses.NoCounter)
+
+    cache.invalidate(path=str(tmpdir))
+    assert isinstance(run(_prop_ok, tmpdir), clauses.NoCounter)
+
+def _cli(cwd, *args):
+    return subprocess.run(
+        [sys.executable, '-m', 'speccer'] + list(args),
+        cwd=cwd, stdout=subprocess.PIPE, universal_newlines=True,
+        env=dict(os.environ, PYTHONPATH=os.pathsep.join([os.getcwd()] + sys.path)))
+
+def test_cli(tmpdir):
+    tmpdir.join('cli_props.py').write('''
+from speccer import forall
+
+def prop_ok():
+    return forall(int, lambda x: x == x)
+''')
+    cwd = str(tmpdir)
+
+    r = _cli(cwd, 'cli_props', '--depth', '3')
+    assert r.returncode == 0
+    assert 'Found no counterexample' in r.stdout
+
+    r = _cli(cwd, 'cli_props', '--depth', '3')
+    assert r.returncode == 0
+    assert 'not run' in r.stdout
+
+    r = _cli(cwd, 'cli_props', '--depth', '3', '--no-cache')
+    assert r.returncode == 0
+    assert 'Found no counterexample' in r.stdout
+
+def test_cli_failure(tmpdir, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmpdir))
+    tmpdir.join('cli_bad_props.py').write('''
+from speccer import forall
+
+def prop_bad():
+    return forall(int, lambda x: x < 2)
+''')
+    assert __main__.main(['cli_bad_props:prop_bad', '--cache-dir', str(tmpdir.join('cache'))]) == 1
@@ -0,0 +1,113 @@
+from speccer import forall, exists, clauses, runtime, Word2
+
+def run(prop, depth=3):
+    g = prop.run(depth)
+    try:
+        while True:
+            next(g)
+    except StopIteration as e:
+        return e.value
+
+def test_nested_forall_failure_path():
+    out = run(forall(int, lambda x: forall(int, lambda y: x + y < 4)))
+    assert isinstance(out, clauses.Counter)
+    assert out.reason.args == (1,)
+    assert isinstance(out.child_outcome, clauses.Counter)
+    assert out.child_outcome.reason.args == (3,)
+
+def test_nested_exists_witness():
+    out = run(forall(bool, lambda x: exists(bool, lambda y: x == y)))
+    assert isinstance(out, clauses.NoCounter)
+
+    out = run(exists(int, lambda x: exists(int, lambda y: x + y == 5)))
+    assert isinstance(out, clauses.Witness)
+    assert out.reason.args == (2,)
+    assert out.child_outcome.reason.args == (3,)
+
+def test_nested_yields_outer_cases_only():
+    g = forall(bool, lambda x: forall(int, lambda y: True)).run(3)
+    assert [c.args for c in g] == [(False,), (True,)]
+
+def test_deeply_nested():
+    def nest(n):
+        if n == 0:
+            return True
+        return forall(Word2, lambda x: nest(n - 1))
+
+    assert isinstance(run(nest(500), depth=1), clauses.NoCounter)
+
+def test_and_short_circuits():
+    calls = []
+
+    def q(x):
+        calls.append(x)
+        return True
+
+    p = forall(int, lambda x: x != 0)
+    out = run(p & forall(int, q), depth=100)
+    assert isinstance(out, clauses.Failure)
+    assert len(calls) <= 1
+
+def test_or_short_circuits():
+    calls = []
+
+    def q(x):
+        calls.append(x)
+        return False
+
+    p = forall(int, lambda x: True)
+    out = run(forall(int, q) | p, depth=5)
+    assert isinstance(out, clauses.Success)
+
+def test_and_no_failure_returns_rhs():
+    p = forall(int, lambda x: True)
+    q = forall(bool, lambda x: True)
+    assert run(p & q).prop is q
+
+def test_cost_order_runs_cheapest_first():
+    calls = []
+
+    def slow(x):
+        calls.append(x)
+        return False
+
+    p = forall(int, lambda x: False)
+    q = forall(int, slow)
+    clauses._COSTS[clauses._cost_key(p)] = [0.0, 10]
+    clauses._COSTS[clauses._cost_key(q)] = [1.0, 10]
+
+    with runtime.change_runtime(runtime.Runtime(cost_order=True)):
+        out = run(q & p)
+
+    assert out.prop is p
+    assert calls == []
+
+def test_cost_shared_by_rebuilt_properties():
+    def make():
+        return forall(int, lambda x: True)
+
+    p, q = make(), make()
+    assert clauses._cost_key(p) == clauses._cost_key(q)
+
+    with runtime.change_runtime(runtime.Runtime(cost_order=True)):
+        run(p & forall(bool, lambda b: True))
+
+    total, n = clauses._COSTS[clauses._cost_key(q)]
+    assert n > 0
+
+def test_outcomes_have_no_dict():
+    p = forall(int, lambda x: True)
+    counter = None
+    outcomes = [
+        clauses.NoCounter(p, []),
+        clauses.Witness(p, counter),
+        clauses.Counter(p, counter),
+        clauses.AssertionCounter(p, counter, 'msg'),
+        clauses.UnrelatedException(p, ValueError()),
+        clauses.NoWitness(p),
+        clauses.UnitSuccess(p),
+        clauses.EmptyFailure(p),
+        clauses.CachedSuccess(p),
+    ]
+    for out in outcomes:
+        assert not hasattr(out, '__dict__'), type(out)
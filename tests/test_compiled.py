@@ -0,0 +1,82 @@
+import typing
+import itertools
+
+import pytest
+
+from speccer import compiled, grapher, ops, strategy, implies, Model, command, _types as types
+
+TYPES = [
+    int, bool, str, types.Nat, types.Neg, types.Word2, types.Word4,
+    typing.List[int],
+    typing.List[bool],
+    typing.List[typing.List[int]],
+    typing.Set[int],
+    typing.Tuple[int, bool],
+    typing.Tuple[int, str, bool],
+    typing.Union[int, str],
+    typing.List[typing.Tuple[int, typing.Union[str, bool]]],
+    [(int, bool)],
+]
+
+# the nested types have ~10^5 values at depth 4, so only a prefix is compared
+PREFIX = 2000
+
+@pytest.fixture(autouse=True)
+def generation_graph(monkeypatch):
+    # generating here adds ~10^5 nodes to the graph, which every later spec() would render
+    monkeypatch.setattr(strategy, 'generation_graph', grapher.Graph())
+
+@pytest.mark.parametrize('t', TYPES, ids=str)
+@pytest.mark.parametrize('depth', range(5))
+def test_compiled_matches_strategy(t, depth):
+    expected = list(itertools.islice(ops.values(depth, t), PREFIX))
+    assert list(itertools.islice(compiled.values(depth, t), PREFIX)) == expected
+
+    n = ops.count(depth, t)
+    if n is not None:
+        assert len(expected) == min(n, PREFIX)
+
+def test_compiled_user_strategy():
+    class A:
+        pass
+
+    class AStrat(strategy.Strategy[A]):
+        def generate(self, depth):
+            yield 'a'
+            yield 'b'
+
+    assert list(compiled.values(2, typing.List[A])) == list(ops.values(2, typing.List[A]))
+
+def test_compiled_mapped_strategy():
+    class Lengths:
+        pass
+
+    @ops.mapS(strategy.Strategy[typing.List[int]], register_type=Lengths)
+    def LengthsStrat(depth, xs):
+        yield len(xs)
+
+    assert list(compiled.values(3, Lengths)) == list(ops.values(3, Lengths))
+
+def test_compiled_implies():
+    def short(xs):
+        return len(xs) < 2
+
+    t = implies(short, typing.List[int])
+    assert list(compiled.values(3, t)) == list(ops.values(3, t))
+
+def test_compiled_model_commands():
+    class M(Model):
+        _STATE = None
+
+        @command
+        def f() -> int:
+            return 0
+
+    expected = list(map(str, ops.values(3, M.Commands)))
+    assert list(map(str, compiled.values(3, M.Commands))) == expected
+
+def test_compiled_missing_strategy():
+    class B:
+        pass
+
+    assert list(compiled.values(2, typing.Tuple[int, B])) == list(ops.values(2, typing.Tuple[int, B]))
@@ -0,0 +1,31 @@
+from speccer import dedup
+
+def test_fingerprint_unhashable():
+    assert dedup.fingerprint([1, {2}]) == dedup.fingerprint([1, {2}])
+    assert dedup.fingerprint([1, 2]) != dedup.fingerprint([2, 1])
+    assert dedup.fingerprint([]) != dedup.fingerprint(set())
+
+def test_fingerprint_types_differ():
+    assert dedup.fingerprint(0) != dedup.fingerprint(False)
+    assert dedup.fingerprint([0]) != dedup.fingerprint((0,))
+
+def test_seen():
+    seen = dedup.Seen()
+    assert seen.add([1, 2])
+    assert seen.add(0)
+    assert not seen.add([1, 2])
+    assert seen.add(False)
+
+def test_seen_bloom():
+    seen = dedup.Seen(exact=4, capacity=1000)
+    for i in range(100):
+        assert seen.add(i)
+    for i in range(100):
+        assert not seen.add(i)
+
+def test_bloom_filter():
+    bf = dedup.BloomFilter(100, 1e-3)
+    for i in range(100):
+        bf.add(i)
+    assert all(i in bf for i in range(100))
+    assert sum(i in bf for i in range(100, 10100)) < 100
@@ -0,0 +1,23 @@
+import io
+
+from speccer import forall, spec, assertEqual
+
+def test_instrument_counts_cases():
+    sio = io.StringIO()
+    outcome = spec(3, forall(int, lambda x: True), outfile=sio, instrument=True)
+    stats = outcome.state['stats']
+    assert stats.cases == outcome.state['calls']
+    assert stats.strategy_values['IntStrat'] > 0
+    assert 'cases/sec' in sio.getvalue()
+
+def test_instrument_counts_assertions():
+    def p(x):
+        assertEqual(x, x)
+
+    outcome = spec(2, forall(int, p), outfile=io.StringIO(), instrument=True)
+    stats = outcome.state['stats']
+    assert stats.assertions == stats.cases
+
+def test_no_instrument_by_default():
+    outcome = spec(2, forall(int, lambda x: True), outfile=io.StringIO())
+    assert 'stats' not in outcome.state
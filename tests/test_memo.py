@@ -0,0 +1,73 @@
+import io
+
+from speccer import pure, forall, spec, clauses
+
+def test_pure_memoises_calls():
+    calls = []
+
+    @pure
+    def f(x, y):
+        calls.append((x, y))
+        return x + y
+
+    assert f(1, 2) == 3
+    assert f(1, 2) == 3
+    assert calls.count((1, 2)) == 1
+    assert f.__memo__.hits >= 1
+
+def test_pure_bounded():
+    @pure(maxsize=2)
+    def f(x):
+        return x
+
+    for i in range(10):
+        f(i)
+
+    assert len(f.__memo__._table) == 2
+
+def test_pure_property_summary():
+    calls = []
+
+    @pure
+    def p(x):
+        calls.append(x)
+        return True
+
+    sio = io.StringIO()
+    spec(3, forall(int, lambda x: forall(int, lambda y: p(abs(y)))), outfile=sio)
+    assert len(calls) == 4
+    assert 'Memoised' in sio.getvalue()
+
+def test_pure_property_memoised_across_outer_values():
+    @pure
+    def p(y):
+        return True
+
+    sio = io.StringIO()
+    spec(3, forall(int, lambda x: forall(int, p)), outfile=sio)
+    assert p.__memo__.hits > 0
+    assert p.__memo__.misses == len(p.__memo__._table)
+
+def test_pure_property_outcome_for_each_property():
+    @pure
+    def p(y):
+        return y >= 0
+
+    q1 = forall(int, p)
+    q2 = forall(int, p)
+    o1 = spec(3, q1, outfile=io.StringIO())
+    o2 = spec(3, q2, outfile=io.StringIO())
+    assert o1.prop is q1
+    assert o2.prop is q2
+
+def test_pure_property_memo_keeps_no_properties():
+    @pure
+    def p(y):
+        return forall(int, lambda z: y + z == z + y)
+
+    spec(3, forall(int, lambda x: forall(int, p)), outfile=io.StringIO())
+    entries = [e for k, e in p.__memo__._table.items() if k[0] == 'run']
+    assert entries
+    for counter, cls, assertions, msg in entries:
+        assert issubclass(cls, clauses.Outcome)
+        assert not isinstance(counter, (clauses.Property, clauses.Outcome))
@@ -45,3 +45,11 @@ def test_intersperse_order():
     xs, v = from_gen(insp)
     assert xs == ['a', 0, True, 'b', 1, False, 'c', 2, 3]
     assert v == (None, None, None)
+
+def _made_in_caller():
+    return StackPath(i=1)
+
+def test_stack_path():
+    path = _made_in_caller()
+    assert str(path).endswith('[test_misc.py]test_stack_path')
+    assert get_stack_path(i=-1).endswith('[test_misc.py]test_stack_path')
@@ -0,0 +1,222 @@
+from speccer import Model, Strategy, command, model, parallel, linearizable, assertEqual
+
+class Counter:
+    def __init__(self):
+        self.n = 0
+
+    def incr(self):
+        self.n += 1
+
+    def get(self):
+        return self.n
+
+class BuggyCounter(Counter):
+    def incr(self):
+        if self.n < 1:
+            self.n += 1
+
+class CounterModel(Model):
+    _STATE = None
+
+    @command
+    def new() -> Counter:
+        return Counter()
+
+    @command
+    def incr(c: Counter) -> None:
+        c.incr()
+
+    @command
+    def get(c: Counter) -> int:
+        return c.get()
+
+    def new_pre(self, args):
+        return self.state is None
+
+    def new_next(self, args, result):
+        return 0
+
+    def incr_pre(self, args):
+        return self.state is not None
+
+    def incr_next(self, args, result):
+        return self.state + 1
+
+    def get_pre(self, args):
+        return self.state is not None
+
+    def get_post(self, args, result):
+        assertEqual(result, self.state)
+
+class BuggyCounterModel(CounterModel):
+    @command
+    def new() -> Counter:
+        return BuggyCounter()
+
+class RaisingCounterModel(CounterModel):
+    @command
+    def incr(c: Counter) -> None:
+        if c.n > 0:
+            raise RuntimeError('counter overflow')
+        c.incr()
+
+def test_validate_model_passes():
+    result = parallel.validate_model(CounterModel, 4, processes=0)
+    assert result.ok
+    assert result.passed > 0
+
+def test_validate_model_first_failure():
+    result = parallel.validate_model(BuggyCounterModel, 5, processes=0)
+    assert not result.ok
+    assert 'get_post' in result.first_failure.message
+
+def test_validate_model_processes_deterministic():
+    serial = parallel.validate_model(BuggyCounterModel, 5, processes=0)
+    pooled = parallel.validate_model(BuggyCounterModel, 5, processes=2, batch_size=2)
+    assert serial.first_failure.index == pooled.first_failure.index
+    assert (serial.passed, serial.skipped, serial.failed) == (pooled.passed, pooled.skipped, pooled.failed)
+
+def test_validate_model_exception_fails_sequence():
+    for processes in (0, 2):
+        result = parallel.validate_model(RaisingCounterModel, 5, processes=processes)
+        assert not result.ok
+        assert result.passed > 0
+        assert 'RuntimeError: counter overflow' in result.first_failure.message
+
+def test_validate_model_batches_streamed():
+    def encs():
+        yield 0, ('a', 'b')
+        yield 1, ('a', 'c')
+        yield 2, ('b',)
+        raise AssertionError('generated past the first batch')
+
+    batches = parallel._batch_by_prefix(encs(), 32, 1)
+    assert next(batches) == [(0, ('a', 'b')), (1, ('a', 'c'))]
+
+def _history(*ops):
+    from speccer.linearizable import Operation
+    return [Operation(t, CounterModel.Commands(None, [cmd(c=None)])[0], (None,), call, ret, result)
+            for t, cmd, call, ret, result in ops]
+
+def test_linearizable_overlapping_increments():
+    ops = _history(
+        (0, CounterModel.incr, 0, 2, None),
+        (1, CounterModel.incr, 1, 3, None),
+        (0, CounterModel.get, 4, 5, 2))
+    assert linearizable.is_linearizable(CounterModel(), ops, 0)
+
+def test_not_linearizable_lost_update():
+    ops = _history(
+        (0, CounterModel.incr, 0, 2, None),
+        (1, CounterModel.incr, 1, 3, None),
+        (0, CounterModel.get, 4, 5, 1))
+    assert not linearizable.is_linearizable(CounterModel(), ops, 0)
+
+class S:
+    '''An unhashable state whose repr does not tell states apart
+    '''
+    __hash__ = None
+
+    def __init__(self, n):
+        self.n = n
+
+    def __eq__(self, other):
+        return self.n == other.n
+
+    def __repr__(self):
+        return 'S'
+
+class SModel(Model):
+    _STATE = None
+
+    @command
+    def add1(c: Counter) -> None:
+        pass
+
+    @command
+    def double(c: Counter) -> None:
+        pass
+
+    @command
+    def get(c: Counter) -> int:
+        pass
+
+    def add1_next(self, args, result):
+        return S(self.state.n + 1)
+
+    def double_next(self, args, result):
+        return S(self.state.n * 2)
+
+    def get_post(self, args, result):
+        return result == self.state.n
+
+def test_linearizable_unhashable_states():
+    from speccer.linearizable import Operation
+    ops = [Operation(t, SModel.Commands(None, [cmd(c=None)])[0], (None,), call, ret, result)
+           for t, cmd, call, ret, result in [
+               (0, SModel.add1, 0, 2, None),
+               (1, SModel.double, 1, 3, None),
+               (0, SModel.get, 4, 5, 3)]]
+
+    # add1 then double reaches S(4), double then add1 reaches S(3)
+    assert linearizable.is_linearizable(SModel(), ops, S(1))
+
+def test_check_linearizable_restores_switch_interval():
+    import sys
+    import threading
+
+    interval = sys.getswitchinterval()
+    cmds = [c for c in Strategy[CounterModel.Commands](4) if len(c) == 3][:20]
+    assert cmds
+
+    def check():
+        for c in cmds:
+            linearizable.check_linearizable(c, threads=2)
+
+    threads = [threading.Thread(target=check) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sys.getswitchinterval() == interval
+
+def test_splits():
+    assert list(linearizable.splits(3, 2)) == [(0, 0, 0), (0, 0, 1), (0, 1, 0), (0, 1, 1)]
+
+def test_check_linearizable():
+    for cmds in Strategy[CounterModel.Commands](4):
+        result = linearizable.check_linearizable(cmds, threads=2)
+        assert result is None or result.linearizable
+
+def test_var_names():
+    assert model.GET_VAR(0) == 'a'
+    assert model.GET_VAR(25) == 'z'
+    assert model.GET_VAR(26) == 'aa'
+    assert model.GET_VAR(26 + 26**2) == 'aaa'
+    assert len(set(model.GET_VAR(i) for i in range(5000))) == 5000
+
+def test_producers_subtypes():
+    producers = model.Producers().add(Counter, 0).add(None, 1).add(BuggyCounter, 2)
+    assert len(producers) == 2
+    assert [r.n for r in producers.of(Counter)] == [0, 2]
+    assert [r.n for r in producers.of(BuggyCounter)] == [2]
+    assert producers.of(int) == []
+
+def test_commands_use_all_argument_positions():
+    class Pair(Model):
+        _STATE = None
+
+        @command
+        def new() -> Counter:
+            return Counter()
+
+        @command
+        def swap(a: Counter, b: Counter) -> None:
+            pass
+
+    # both arguments of swap can come from either new()
+    seqs = [
+        cmds for cmds in Strategy[Pair.Commands](4)
+        if [p.command for p in cmds] == [Pair.new, Pair.new, Pair.swap]]
+    assert len(seqs) == 4
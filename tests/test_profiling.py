@@ -0,0 +1,35 @@
+import io
+import os
+import pstats
+
+from speccer import forall, spec
+from speccer import profiling
+
+def _busy(x):
+    return sum(range(1000)) >= 0
+
+def test_cprofile_writes_pstats(tmpdir):
+    prop = forall(int, _busy)
+    outcome = spec(50, prop, outfile=io.StringIO(), profile='cprofile', profile_dir=str(tmpdir))
+    profile = outcome.state['profile']
+    assert profile.path == os.path.join(str(tmpdir), profiling._filename(prop.name, 'pstats'))
+    assert pstats.Stats(profile.path).total_calls > 0
+    assert profile.user > 0
+
+def test_sample_writes_folded(tmpdir):
+    outcome = spec(50, forall(int, _busy), outfile=io.StringIO(), profile='sample', profile_dir=str(tmpdir))
+    profile = outcome.state['profile']
+    assert profile.path.endswith('.folded')
+    assert os.path.exists(profile.path)
+
+def test_profile_only(tmpdir):
+    outcome = spec(5, forall(int, _busy), outfile=io.StringIO(),
+                   profile='cprofile', profile_dir=str(tmpdir), profile_only=['prop_other'])
+    assert 'profile' not in outcome.state
+    assert tmpdir.listdir() == []
+
+def test_category():
+    assert profiling._category(profiling.__file__) == 'speccer'
+    assert profiling._category(__file__) == 'user'
+    assert profiling._category(os.__file__) == 'other'
+    assert profiling._category('~') == 'other'
@@ -0,0 +1,52 @@
+import io
+
+from speccer import spec, forall, PropertySet, parallel
+
+class _PSet(PropertySet):
+    def prop_pass(self):
+        return forall(int, lambda x: True)
+
+    def prop_fail(self):
+        return forall(int, lambda x: x < 2)
+
+    def prop_error(self):
+        raise ValueError('no property')
+
+def run_pset(processes):
+    sio = io.StringIO()
+    result = spec(3, _PSet, outfile=sio, processes=processes)
+    return result, sio.getvalue()
+
+def test_pset_in_process():
+    result, out = run_pset(0)
+    assert [r.name for r in result.results] == ['prop_error', 'prop_fail', 'prop_pass']
+    assert [r.result for r in result.results] == ['error', 'fail', 'pass']
+    assert result.results[1].calls == 4
+    assert result.results[1].value is not None
+    assert not result.ok
+    assert 'FAIL (1 failed, 1 errors)' in out
+
+def test_pset_across_processes():
+    result, out = run_pset(2)
+    assert [r.result for r in result.results] == ['error', 'fail', 'pass']
+    assert 'counterexample' in result.results[1].report
+    assert 'ValueError' in result.results[0].report
+    assert result.results[2].calls == 7
+
+def test_pset_in_process_by_default():
+    result = spec(3, _PSet, outfile=None)
+    assert all(r.value is not None for r in result.results if r.result != 'error')
+
+def test_local_pset_falls_back_to_in_process():
+    class Local(PropertySet):
+        def prop_local(self):
+            return forall(int, lambda x: True)
+
+    result = spec(3, Local, outfile=None, processes=2)
+    assert [r.result for r in result.results] == ['pass']
+    assert result.results[0].value is not None
+
+def test_failing_pset_in_iterable():
+    out = spec(3, [_PSet, forall(int, lambda x: True)], outfile=None)
+    assert isinstance(out, parallel.PropertySetResult)
+    assert not out.ok
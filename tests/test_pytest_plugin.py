@@ -0,0 +1,64 @@
+pytest_plugins = ['pytester']
+
+PROPS = '''
+from speccer import forall, PropertySet
+
+def prop_pass():
+    return forall(int, lambda x: True)
+
+def prop_fail():
+    return forall(int, lambda x: x < 2)
+
+class PSet(PropertySet):
+    def prop_one(self):
+        return forall(int, lambda x: x == x)
+
+    def prop_two(self):
+        return forall(bool, lambda b: b or not b)
+
+class _Hidden(PropertySet):
+    def prop_hidden(self):
+        return forall(int, lambda x: False)
+'''
+
+def run(pytester, *args):
+    return pytester.runpytest('-p', 'no:speccer', '-p', 'speccer.pytest_plugin', '--speccer-depth', '3', *args)
+
+def test_collects_properties(pytester):
+    pytester.makepyfile(test_props=PROPS)
+    result = run(pytester, '--collect-only', '-q')
+    result.stdout.fnmatch_lines([
+        'test_props.py::prop_pass',
+        'test_props.py::prop_fail',
+        'test_props.py::PSet::prop_one',
+        'test_props.py::PSet::prop_two',
+    ])
+
+def test_runs_and_reports_failures(pytester):
+    pytester.makepyfile(test_props=PROPS)
+    result = run(pytester)
+    result.assert_outcomes(passed=3, failed=1)
+    result.stdout.fnmatch_lines(['*counterexample*'])
+
+def test_skips_unchanged_passing(pytester):
+    pytester.makepyfile(test_props=PROPS)
+    run(pytester)
+
+    result = run(pytester)
+    result.assert_outcomes(skipped=3, failed=1)
+
+    result = run(pytester, '--speccer-no-cache')
+    result.assert_outcomes(passed=3, failed=1)
+
+def test_reruns_changed(pytester):
+    pytester.makepyfile(test_props=PROPS)
+    run(pytester)
+
+    pytester.makepyfile(test_props=PROPS.replace('x == x', 'x + 0 == x'))
+    result = run(pytester)
+    result.assert_outcomes(passed=2, skipped=1, failed=1)
+
+def test_stats(pytester):
+    pytester.makepyfile(test_props=PROPS)
+    result = run(pytester, '--speccer-stats')
+    result.stdout.fnmatch_lines(['*speccer*', '*prop_pass*pass*call(s)*'])
@@ -0,0 +1,41 @@
+import io
+import json
+
+from speccer import spec, forall, reporting
+
+def run_json(depth, p):
+    sio = io.StringIO()
+    spec(depth, p, outfile=None, json_file=sio)
+    return [json.loads(line) for line in sio.getvalue().splitlines()]
+
+def test_json_events():
+    events = run_json(3, forall(int, lambda x: x < 2))
+    assert events[0]['event'] == 'start'
+    assert events[0]['depth'] == 3
+    assert all(e['event'] == 'progress' for e in events[1:-1])
+
+    finish = events[-1]
+    assert finish['event'] == 'finish'
+    assert finish['result'] == 'fail'
+    assert finish['counterexample'] == {'x': '2'}
+    assert finish['calls'] == 4
+
+def test_json_pass():
+    finish = run_json(2, forall(int, lambda x: True))[-1]
+    assert finish['result'] == 'pass'
+    assert finish['calls'] == 5
+
+def test_custom_reporter():
+    class Counting(reporting.Reporter):
+        def __init__(self):
+            self.events = []
+
+        def start(self, prop, depth):
+            self.events.append('start')
+
+        def finish(self, prop, depth, outcome, calls, scale, elapsed):
+            self.events.append('finish')
+
+    r = Counting()
+    spec(2, forall(int, lambda x: True), outfile=None, reporters=[r])
+    assert r.events == ['start', 'finish']
@@ -0,0 +1,52 @@
+import random
+import typing
+import collections
+
+from speccer import sampling, ops, strategy, spec, forall, implies, clauses
+
+LIST_LIST_INT = typing.List[typing.List[int]]
+
+def test_sample_values_in_strategy():
+    vs = ops.values(3, typing.List[typing.Tuple[int, typing.Union[str, bool]]])
+    expected = list(vs)
+    for v in sampling.sample(3, typing.List[typing.Tuple[int, typing.Union[str, bool]]], 100, random.Random(0)):
+        assert v in expected
+
+def test_sample_seeded():
+    a = list(sampling.sample(10, LIST_LIST_INT, 20, random.Random(1)))
+    b = list(sampling.sample(10, LIST_LIST_INT, 20, random.Random(1)))
+    assert a == b
+    assert len(a) == 20
+
+def test_sample_uniform():
+    t = typing.Union[int, str]
+    vs = list(ops.values(2, t))
+    assert len(vs) == 8
+
+    counts = collections.Counter(sampling.sample(2, t, 8000, random.Random(2)))
+    assert set(counts) == set(vs)
+    for v in vs:
+        assert 800 < counts[v] < 1200
+
+def test_sample_large_depth():
+    xss = list(sampling.sample(10, LIST_LIST_INT, 50, random.Random(3)))
+    assert max(map(len, xss)) > 3
+
+def test_sample_mapped():
+    class Lengths:
+        pass
+
+    @ops.mapS(strategy.Strategy[typing.List[int]], register_type=Lengths)
+    def LengthsStrat(depth, xs):
+        yield len(xs)
+
+    expected = list(ops.values(3, Lengths))
+    assert list(sampling.sample(3, Lengths, 10, random.Random(4))) == expected[:10]
+    assert sampling.draw(3, Lengths, random.Random(4)) in expected
+
+def test_sample_implies():
+    def even(x):
+        return x % 2 == 0
+
+    out = spec(3, forall(implies(even, int), lambda x: x % 2 == 0), samples=50, seed=1, outfile=None)
+    assert isinstance(out, clauses.Success)
@@ -0,0 +1,116 @@
+import typing
+import collections
+
+from speccer import shrinking, spec, forall, exists, implies, assume, clauses
+
+from .test_model import BuggyCounterModel
+
+def test_shrink_int():
+    s = shrinking.shrink(100, int, 40, lambda x: x > 5)
+    assert s.value == 6
+    assert s.steps[-1] == 6
+
+def test_shrink_negative_int():
+    s = shrinking.shrink(100, int, -40, lambda x: abs(x) > 5)
+    assert s.value == 6
+
+def test_shrink_list():
+    s = shrinking.shrink(5, typing.List[int], [3, -2, 1, 4], lambda xs: len(xs) >= 2)
+    assert s.value == [0, 0]
+
+def test_shrink_tuple():
+    s = shrinking.shrink(5, typing.Tuple[int, bool], (4, True), lambda t: t[0] > 1)
+    assert s.value == (2, False)
+
+def test_shrink_union():
+    s = shrinking.shrink(5, typing.Union[int, str], 'd', lambda v: True)
+    assert s.value == 0
+
+def test_shrink_budget():
+    calls = []
+
+    def fails(x):
+        calls.append(x)
+        return x > 5
+
+    s = shrinking.shrink(1000, int, 1000, fails, budget=3)
+    assert s.evaluations == 3
+    assert len(calls) == 3
+
+def test_shrink_no_strategy():
+    class A:
+        pass
+
+    s = shrinking.shrink(5, A, A(), lambda _: True)
+    assert s.steps == []
+    assert s.evaluations == 0
+
+def test_shrink_skips_candidates_that_raise():
+    failed = []
+
+    # 0 is tried first by the run, but only raises once shrinking has started
+    def p(x):
+        if x == 0 and failed:
+            raise ValueError('not a counterexample')
+        if x >= 100:
+            failed.append(x)
+            return False
+        return True
+
+    out = spec(200, forall(int, p), outfile=None, shrink=True)
+    assert isinstance(out, clauses.Counter)
+    assert out.reason.arguments['x'] == 100
+
+def test_shrink_rerun_failing_assumption():
+    seen = collections.Counter()
+
+    def p(x):
+        seen[x] += 1
+        if x == 6 and seen[x] > 1:
+            assume(False)
+        return x <= 5
+
+    out = spec(10, forall(int, p), outfile=None, shrink=True)
+    assert isinstance(out, clauses.Counter)
+    assert out.reason.arguments['x'] == 6
+    assert out.state['shrink'] is None
+
+def even(x):
+    return x % 2 == 0
+
+def test_shrink_implies():
+    s = shrinking.shrink(100, implies(even, int), 40, lambda x: x > 5)
+    assert s.value > 5
+    assert all(map(even, s.steps))
+
+def test_shrink_implies_list():
+    def nonempty(xs):
+        return len(xs) > 0
+
+    out = spec(4, forall(implies(nonempty, typing.List[int]), lambda xs: len(xs) < 2), outfile=None, shrink=True)
+    assert type(out) is clauses.Counter
+    assert out.reason.arguments['xs'] == [0, 0]
+
+def test_shrink_model():
+    out = spec(5, forall(BuggyCounterModel.Commands, BuggyCounterModel.is_valid), outfile=None, shrink=True)
+    assert isinstance(out, clauses.Counter)
+    assert out.state['shrink'].steps == []
+
+def test_shrink_var_positional():
+    out = spec(10, forall(int, lambda *xs: xs[0] < 5), outfile=None, shrink=True)
+    assert out.reason.arguments['xs'] == (5,)
+    assert out.state['shrink'].value == 5
+
+def test_shrink_only_root():
+    def run(shrink):
+        calls = []
+
+        def p(x):
+            calls.append(x)
+            return x < 3
+
+        out = spec(6, exists(bool, lambda b: forall(int, p)), outfile=None, shrink=shrink)
+        assert isinstance(out, clauses.NoWitness)
+        return calls
+
+    assert run(True) == run(False)
@@ -2,7 +2,7 @@ import sys
 import io
 import contextlib
 
-from speccer import spec, unit, empty
+from speccer import spec, unit, empty, forall
 
 def run_spec(depth, p):
     sio = io.StringIO()
@@ -22,3 +22,24 @@ def test_unit():
 
 def test_empty():
     assert 'FAIL' in run_spec_nostdout(3, empty)
+
+class FakeTTY(io.StringIO):
+    def isatty(self):
+        return True
+
+def test_no_progress_when_not_a_tty():
+    out = run_spec(3, forall(int, lambda x: True))
+    assert out.startswith('-' * 80)
+
+def test_dots_progress():
+    sio = io.StringIO()
+    spec(3, forall(int, lambda x: True), outfile=sio, progress='dots', progress_interval=0)
+    assert sio.getvalue().startswith('.......')
+
+def test_status_progress_on_tty():
+    sio = FakeTTY()
+    spec(3, forall(int, lambda x: True), outfile=sio, progress_interval=0)
+    out = sio.getvalue()
+    assert 'case(s)' in out
+    assert '\r' in out
+    assert 'OK' in out
@@ -29,3 +29,81 @@ def test_union():
 
 def test_set_ints():
     assert listify({int}, 2) == [set(), {0}, {1}, {-1}, {2}, {-2}]
+
+def test_lookup_cached():
+    assert strategy.Strategy[[int]] is strategy.Strategy[typing.List[int]]
+
+def test_register_invalidates_lookup():
+    class A:
+        pass
+
+    assert not strategy.has_strat_instance(A)
+
+    class AStrat(strategy.Strategy[A]):
+        def generate(self, depth):
+            yield A()
+
+    assert strategy.get_strat_instance(A) is AStrat
+
+RANDOM_ACCESS_TYPES = [
+    int, bool, str, Neg,
+    typing.List[int],
+    typing.List[typing.List[bool]],
+    typing.Set[int],
+    typing.Tuple[int, str, bool],
+    typing.Union[int, str],
+    typing.List[typing.Tuple[int, typing.Union[str, bool]]],
+]
+
+def test_count():
+    for t in RANDOM_ACCESS_TYPES:
+        for d in range(4):
+            assert ops.count(d, t) == len(listify(t, d))
+
+def test_nth():
+    for t in RANDOM_ACCESS_TYPES:
+        for d in range(4):
+            vs = listify(t, d)
+            assert [ops.nth(d, t, k) for k in range(len(vs))] == vs
+
+def test_nth_out_of_range():
+    import pytest
+    with pytest.raises(IndexError):
+        ops.nth(2, typing.List[int], ops.count(2, typing.List[int]))
+
+def test_count_unknown():
+    class C:
+        pass
+
+    class CStrat(strategy.Strategy[C]):
+        def generate(self, depth):
+            yield 'x'
+            yield 'y'
+
+    assert ops.count(2, typing.List[C]) is None
+    assert ops.nth(2, typing.List[C], 2) == listify(typing.List[C], 2)[2]
+
+def test_mapped_count_nth():
+    class Doubled:
+        pass
+
+    @ops.mapS(strategy.Strategy[int], register_type=Doubled)
+    def DoubledStrat(depth, x):
+        yield 2*x
+
+    vs = listify(Doubled, 3)
+    assert ops.count(3, Doubled) is None
+    assert [ops.nth(3, Doubled, k) for k in range(len(vs))] == vs
+
+def test_implies_count_nth():
+    def even(x):
+        return x % 2 == 0
+
+    t = ops.implies(even, int)
+    vs = listify(t, 3)
+    assert vs == [0, 2, -2]
+    assert ops.count(3, t) is None
+    assert [ops.nth(3, t, k) for k in range(len(vs))] == vs
+
+def test_product_indices():
+    assert list(strategy.product_indices(2, 3)) == list(strategy.generate_args_from_strategies(range(2), range(3)))
@@ -131,3 +131,16 @@ def test_union_instance():
     assert it.origin.origin is None
     assert it.origin.args == []
     assert it.arity == 0
+
+def test_is_subtype():
+    class A:
+        pass
+
+    class B(A):
+        pass
+
+    assert typeable.is_subtype(B, A)
+    assert not typeable.is_subtype(A, B)
+    assert typeable.is_subtype(bool, int)
+    assert typeable.is_subtype([int], typing.List[int])
+    assert not typeable.is_subtype(typing.List[bool], typing.List[int])